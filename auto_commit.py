@@ -6,71 +6,91 @@ Auto Commit - AI 기반 자동 커밋 도구
 
 import sys
 import argparse
-from typing import List, Optional
-from pathlib import Path
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict
 
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.prompt import Confirm, Prompt
-    from rich.table import Table
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-except ImportError:
-    print("Error: rich 라이브러리가 설치되지 않았습니다.")
-    print("다음 명령어를 실행하세요: pip install -r requirements.txt")
-    sys.exit(1)
+if TYPE_CHECKING:
+    from git_analyzer import GitChanges, FileChange
+    from response_cache import ResponseCache
+
+
+# rich Console (무거운 import를 피하기 위해 main()에서 인자 파싱 후 생성)
+console = None
 
-from git_analyzer import GitAnalyzer, GitChanges
-from commit_message_generator import CommitMessageGenerator
-from config_manager import ConfigManager
-from code_reviewer import CodeReviewer, ReviewLevel
+# 변경 타입별 표시 기호
+_CHANGE_SYMBOL = {
+    'A': '[green]+[/green]',
+    'M': '[yellow]M[/yellow]',
+    'D': '[red]-[/red]',
+    'R': '[blue]R[/blue]'
+}
 
+# 같은 파일이 staged/unstaged 양쪽에 있을 때 남길 변경 타입 (앞쪽 우선)
+_CHANGE_PRIORITY = ('A', 'D', 'R', 'M')
 
-console = Console()
 
+# provider별 SDK 클라이언트 (리뷰와 커밋 메시지 생성이 같은 연결을 재사용)
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
 
-def print_changes_summary(changes: GitChanges):
+
+class _Exit(SystemExit):
+    """main() 종료 신호 (finally의 정리 코드를 거쳐 종료 코드 전달)"""
+
+
+def print_changes_summary(changes: "GitChanges"):
     """변경사항 요약 출력"""
+    from rich.table import Table
+    
     table = Table(title="📊 변경사항 요약")
     table.add_column("항목", style="cyan")
     table.add_column("값", style="green")
     
-    table.add_row("Staged 파일", str(len(changes.staged_files)))
-    table.add_row("Unstaged 파일", str(len(changes.unstaged_files)))
-    table.add_row("총 파일", str(changes.total_files))
-    table.add_row("삽입", f"+{changes.total_insertions} 줄", style="green")
-    table.add_row("삭제", f"-{changes.total_deletions} 줄", style="red")
+    rows = (
+        ("Staged 파일", str(len(changes.staged_files)), None),
+        ("Unstaged 파일", str(len(changes.unstaged_files)), None),
+        ("총 파일", str(changes.total_files), None),
+        ("삽입", f"+{changes.total_insertions} 줄", "green"),
+        ("삭제", f"-{changes.total_deletions} 줄", "red"),
+    )
+    add_row = table.add_row
+    for name, value, style in rows:
+        add_row(name, value, style=style)
     
     console.print(table)
 
 
-def print_file_list(changes: GitChanges):
-    """변경된 파일 목록 출력"""
+def _file_lines(files: List["FileChange"], title: str, style: str) -> List[str]:
+    """파일 목록 한 그룹의 출력 라인 생성"""
+    from rich.markup import escape
+    
+    lines = [f"\n[bold {style}]{title}:[/bold {style}]"]
+    for f in files:
+        symbol = _CHANGE_SYMBOL.get(f.change_type, '?')
+        lines.append(f"  {symbol} {escape(f.path)} [dim](+{f.insertions}/-{f.deletions})[/dim]")
+    return lines
+
+
+def print_file_list(changes: "GitChanges"):
+    """변경된 파일 목록 출력 (파일 수와 무관하게 한 번에 출력)"""
+    lines = []
+    
     if changes.staged_files:
-        console.print("\n[bold cyan]Staged 파일:[/bold cyan]")
-        for f in changes.staged_files:
-            change_type_symbol = {
-                'A': '[green]+[/green]',
-                'M': '[yellow]M[/yellow]',
-                'D': '[red]-[/red]',
-                'R': '[blue]R[/blue]'
-            }.get(f.change_type, '?')
-            console.print(f"  {change_type_symbol} {f.path} [dim](+{f.insertions}/-{f.deletions})[/dim]")
+        lines.extend(_file_lines(changes.staged_files, "Staged 파일", "cyan"))
     
     if changes.unstaged_files:
-        console.print("\n[bold yellow]Unstaged 파일:[/bold yellow]")
-        for f in changes.unstaged_files:
-            change_type_symbol = {
-                'A': '[green]+[/green]',
-                'M': '[yellow]M[/yellow]',
-                'D': '[red]-[/red]',
-                'R': '[blue]R[/blue]'
-            }.get(f.change_type, '?')
-            console.print(f"  {change_type_symbol} {f.path} [dim](+{f.insertions}/-{f.deletions})[/dim]")
+        lines.extend(_file_lines(changes.unstaged_files, "Unstaged 파일", "yellow"))
+    
+    if lines:
+        console.print("\n".join(lines))
 
 
 def print_commit_message(message: str):
     """커밋 메시지 출력"""
+    from rich.panel import Panel
+    
     console.print(
         Panel(
             message,
@@ -83,18 +103,190 @@ def print_commit_message(message: str):
 
 def print_code_review(review: str, token_estimate: int):
     """코드 리뷰 결과 출력"""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.text import Text
+    
     console.print(
-        Panel(
-            review,
-            title="🔍 AI 코드 리뷰",
-            border_style="cyan",
-            padding=(1, 2)
+        Group(
+            Panel(
+                review,
+                title="🔍 AI 코드 리뷰",
+                border_style="cyan",
+                padding=(1, 2)
+            ),
+            Text.from_markup(f"[dim]💡 예상 토큰 사용: ~{token_estimate} tokens[/dim]\n")
         )
     )
-    console.print(f"[dim]💡 예상 토큰 사용: ~{token_estimate} tokens[/dim]\n")
 
 
-def main():
+def _merge(first: "FileChange", second: "FileChange") -> "FileChange":
+    """같은 경로의 staged/unstaged 항목을 하나로 합침 (라인 수 합산, diff는 이후 다시 가져옴)"""
+    from git_analyzer import FileChange
+    
+    change_type = min(
+        (first.change_type, second.change_type),
+        key=lambda t: _CHANGE_PRIORITY.index(t) if t in _CHANGE_PRIORITY else len(_CHANGE_PRIORITY)
+    )
+    return FileChange(
+        path=first.path,
+        change_type=change_type,
+        insertions=first.insertions + second.insertions,
+        deletions=first.deletions + second.deletions,
+        diff=''
+    )
+
+
+def normalize_file_args(patterns: List[str], repo_root: str) -> frozenset:
+    """--files 인자를 git 경로 형식(저장소 루트 기준, '/' 구분)으로 정규화
+    
+    셸이 확장하지 않은 glob 패턴(예: 'src/*.py')도 여기서 확장합니다.
+    """
+    import os
+    import glob
+    
+    repo_root = os.path.realpath(repo_root)
+    wanted = set()
+    
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if any(c in pattern for c in '*?[') else []
+        # 매칭되는 파일이 없으면 (예: 삭제된 파일) 원래 경로 그대로 사용
+        for path in matches or [pattern]:
+            rel_path = os.path.relpath(os.path.realpath(path), repo_root)
+            wanted.add(rel_path.replace(os.sep, '/'))
+    
+    return frozenset(wanted)
+
+
+@contextmanager
+def live_panel(title: str, border_style: str):
+    """스트리밍 응답을 실시간으로 보여주는 패널 (토큰 추가 콜백 반환)"""
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+    
+    text = Text()
+    panel = Panel(text, title=title, border_style=border_style, padding=(1, 2))
+    
+    # transient: 완료 후 패널을 지우고 최종 결과는 print_* 함수로 출력
+    with Live(panel, console=console, transient=True, refresh_per_second=12):
+        yield text.append
+
+
+def edit_commit_message(message: str) -> str:
+    """커밋 메시지 편집
+    
+    GIT_EDITOR/VISUAL/EDITOR가 설정되어 있으면 `git commit`처럼 임시 파일을 에디터로 열고,
+    없으면 표준 입력을 EOF(Ctrl-D, Windows는 Ctrl-Z)까지 한 번에 읽습니다.
+    """
+    import os
+    
+    editor = os.environ.get('GIT_EDITOR') or os.environ.get('VISUAL') or os.environ.get('EDITOR')
+    
+    if not editor:
+        console.print("\n[cyan]커밋 메시지를 입력하세요 (입력을 마치면 Ctrl-D, Windows는 Ctrl-Z 후 Enter):[/cyan]")
+        return sys.stdin.read().strip()
+    
+    import shlex
+    import subprocess
+    import tempfile
+    
+    # AI가 생성한 메시지를 시작점으로 임시 파일 작성 (Windows에서 에디터가 열 수 있도록 먼저 닫음)
+    with tempfile.NamedTemporaryFile('w', suffix='.gitcommit', encoding='utf-8', delete=False) as f:
+        f.write(message + '\n')
+        path = f.name
+    
+    try:
+        result = subprocess.run(shlex.split(editor, posix=os.name != 'nt') + [path])
+        if result.returncode != 0:
+            raise RuntimeError(f"에디터 실행 실패: {editor} (exit {result.returncode})")
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    finally:
+        os.unlink(path)
+
+
+def get_client(provider: str, api_key: str):
+    """provider SDK 클라이언트 생성 또는 재사용 (SDK가 없으면 None)"""
+    with _clients_lock:
+        if provider in _clients:
+            return _clients[provider]
+        
+        try:
+            if provider == "openai":
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key)
+            elif provider == "anthropic":
+                import anthropic
+                client = anthropic.Anthropic(api_key=api_key)
+            elif provider == "gemini":
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                client = genai
+            else:
+                return None
+        except ImportError:
+            # 설치 안내는 provider 생성 시 출력
+            return None
+        
+        _clients[provider] = client
+        return client
+
+
+def warm_up_client(provider: str, api_key: str) -> None:
+    """SDK import와 클라이언트 생성을 미리 수행 (백그라운드 스레드용, API 요청은 보내지 않음)"""
+    try:
+        get_client(provider, api_key)
+    except Exception:
+        pass
+
+
+def close_clients() -> None:
+    """생성된 SDK 클라이언트의 HTTP 연결 정리"""
+    with _clients_lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                close()
+        _clients.clear()
+
+
+def run_code_review(provider: str, api_key: str, files: List["FileChange"],
+                    config: dict, level: str,
+                    on_token: Optional[Callable[[str], None]] = None,
+                    session_key: Optional[str] = None,
+                    cache: Optional["ResponseCache"] = None) -> Dict:
+    """코드 리뷰 수행 (리뷰 결과 반환, session_key가 있으면 바뀐 파일만 다시 리뷰)"""
+    from code_reviewer import CodeReviewer, ReviewSession
+    
+    reviewer = CodeReviewer(provider=provider, api_key=api_key, client=get_client(provider, api_key),
+                            cache=cache)
+    session = ReviewSession(session_key) if session_key else None
+    return reviewer.review(files, config, level=level, on_token=on_token, session=session)
+
+
+def generate_commit_message(provider: str, api_key: str, files: List["FileChange"],
+                            config: dict,
+                            on_token: Optional[Callable[[str], None]] = None,
+                            cache: Optional["ResponseCache"] = None) -> str:
+    """커밋 메시지 생성 (생성된 메시지 반환, on_token 지정 시 스트리밍)"""
+    from commit_message_generator import CommitMessageGenerator, build_system_prompt
+    
+    # 정적 설정은 시스템 프롬프트(캐시 대상)로, 변경사항은 사용자 프롬프트로 분리
+    generator = CommitMessageGenerator(
+        provider=provider,
+        api_key=api_key,
+        system_prompt=build_system_prompt(config),
+        client=get_client(provider, api_key),
+        cache=cache
+    )
+    
+    return generator.generate(files, config, on_token=on_token)
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """CLI 인자 파서 생성 (프로세스당 한 번만 생성)"""
     parser = argparse.ArgumentParser(
         description="AI 기반 자동 커밋 도구",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -183,8 +375,35 @@ def main():
         help='리뷰만 수행하고 커밋하지 않음'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    args = _build_parser().parse_args()
+    
+    if args.verbose:
+        # git 분석 진행 로그 (파일별 상태/라인 수) 출력
+        import logging
+        logging.basicConfig(format='%(message)s')
+        logging.getLogger('git_analyzer').setLevel(logging.DEBUG)
     
+    # 무거운 모듈은 인자 파싱 이후에 로드 (--help 등에서는 import 비용 없음)
+    global console
+    try:
+        from rich.console import Console
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+    except ImportError:
+        print("Error: rich 라이브러리가 설치되지 않았습니다.")
+        print("다음 명령어를 실행하세요: pip install -r requirements.txt")
+        sys.exit(1)
+    
+    console = Console()
+    
+    from config_manager import ConfigManager
+    from git_analyzer import GitAnalyzer
+    
+    analyzer = None
+    warm_up = None
     try:
         # 설정 로드
         console.print("[bold blue]⚙️  설정 로드 중...[/bold blue]")
@@ -192,33 +411,52 @@ def main():
         
         if not config.validate():
             console.print("[bold red]❌ 설정이 유효하지 않습니다.[/bold red]")
-            sys.exit(1)
+            raise _Exit(1)
         
         if args.verbose:
             config.print_config()
         
+        # 자주 쓰는 설정값은 한 번만 조회
+        config_dict = config.to_dict()
+        review_config = config.get('review', {}) or {}
+        cache_config = config.get('cache', {}) or {}
+        auto_add_config = config.get('git.auto_add', False)
+        
+        # AI 제공자 (리뷰 및 커밋 메시지 생성에 사용)
+        provider = config.get_ai_provider()
+        api_key = config.get_api_key(provider)
+        
         # Git 저장소 분석
         console.print("\n[bold blue]📊 Git 변경사항 분석 중...[/bold blue]")
         analyzer = GitAnalyzer()
         
         if not analyzer.has_changes():
             console.print("[yellow]변경사항이 없습니다.[/yellow]")
-            sys.exit(0)
+            raise _Exit(0)
         
-        # 변경사항 가져오기
-        changes = analyzer.get_all_changes(include_untracked=not args.staged_only)
+        # 변경사항 목록을 만드는 동안 SDK import와 클라이언트 생성을 미리 수행
+        warm_up = threading.Thread(target=warm_up_client, args=(provider, api_key), daemon=True)
+        warm_up.start()
+        
+        # AI 관련 모듈은 변경사항이 있을 때만 로드
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        from code_reviewer import ReviewLevel
+        from response_cache import ResponseCache
+        
+        # 변경사항 가져오기 (요약/목록에는 patch가 필요 없으므로 이름/통계만)
+        changes = analyzer.get_all_changes(include_untracked=not args.staged_only, patches=False)
         
         # 특정 파일만 선택
         if args.files:
-            # 파일 필터링
-            file_set = set(args.files)
+            # 파일 필터링 (glob 확장 + 저장소 루트 기준 경로로 정규화)
+            file_set = normalize_file_args(args.files, analyzer.working_dir)
             changes.staged_files = [f for f in changes.staged_files if f.path in file_set]
             changes.unstaged_files = [f for f in changes.unstaged_files if f.path in file_set]
             changes.total_files = len(changes.staged_files) + len(changes.unstaged_files)
         
         if changes.total_files == 0:
             console.print("[yellow]커밋할 변경사항이 없습니다.[/yellow]")
-            sys.exit(0)
+            raise _Exit(0)
         
         # 변경사항 요약 출력
         print_changes_summary(changes)
@@ -226,13 +464,15 @@ def main():
         
         # Unstaged 파일 처리
         if changes.unstaged_files and not args.staged_only:
-            auto_add = config.get('git.auto_add', False) and not args.no_add
+            auto_add = auto_add_config and not args.no_add
             
             if auto_add:
                 console.print("\n[yellow]⚠️  Unstaged 파일을 자동으로 staging합니다.[/yellow]")
                 analyzer.stage_file_changes(changes.unstaged_files)
             else:
                 if not args.auto_yes:
+                    # 대화형 입력이 필요한 경우에만 로드 (--auto-yes 등 비대화형 실행에서는 import 안 함)
+                    from rich.prompt import Confirm
                     add_files = Confirm.ask("\nUnstaged 파일을 staging하시겠습니까?")
                     if add_files:
                         analyzer.stage_file_changes(changes.unstaged_files)
@@ -247,15 +487,22 @@ def main():
         # 커밋할 파일 목록
         files_to_commit = changes.staged_files + changes.unstaged_files
         
+        # 같은 파일이 staged/unstaged 양쪽에 있으면 하나로 합쳐 AI에 한 번만 전달
+        by_path = {}
+        for f in files_to_commit:
+            prev = by_path.get(f.path)
+            by_path[f.path] = _merge(prev, f) if prev else f
+        files_to_commit = list(by_path.values())
+        
         if not files_to_commit:
             console.print("[yellow]커밋할 파일이 없습니다.[/yellow]")
-            sys.exit(0)
+            raise _Exit(0)
         
-        # AI 제공자 가져오기 (리뷰 및 커밋 메시지 생성에 사용)
-        provider = config.get_ai_provider()
+        # 리뷰/커밋 메시지 생성에 공통으로 쓸 patch를 커밋할 파일만 한 번에 가져오기
+        analyzer.load_diffs(files_to_commit)
         
         # 코드 리뷰 수행 여부 결정
-        review_enabled = config.get('review', {}).get('enabled', False)
+        review_enabled = review_config.get('enabled', False)
         should_review = (
             args.review or 
             args.review_detailed or 
@@ -263,47 +510,70 @@ def main():
             (review_enabled and not args.no_review)
         )
         
-        # 코드 리뷰 수행
+        # 리뷰 레벨 결정
+        if args.review_detailed:
+            review_level = ReviewLevel.DETAILED
+        elif args.review_level:
+            review_level = args.review_level
+        else:
+            # config에서 기본 레벨 가져오기
+            review_level = review_config.get('default_level', 'quick')
+        
+        # 반복 리뷰 세션 (저장소 + 브랜치별, 이전 리뷰 이후 바뀐 파일만 전송)
+        session_key = None
+        if review_config.get('session_delta', False):
+            branch = analyzer.get_current_branch() or 'HEAD'  # detached HEAD
+            session_key = f"{analyzer.working_dir}@{branch}"
+        
+        # 응답 캐시 (동일한 diff + provider/model/설정이면 API 호출 생략)
+        response_cache = ResponseCache(
+            ttl_hours=cache_config.get('ttl_hours', 24),
+            enabled=cache_config.get('enabled', True)
+        )
+        
         review_result = None
-        if should_review:
-            console.print("\n[bold cyan]🔍 AI 코드 리뷰 수행 중...[/bold cyan]")
-            
-            # 리뷰 레벨 결정
-            if args.review_detailed:
-                review_level = ReviewLevel.DETAILED
-            elif args.review_level:
-                review_level = args.review_level
-            else:
-                # config에서 기본 레벨 가져오기
-                default_level = config.get('review', {}).get('default_level', 'quick')
-                review_level = default_level
+        commit_message = None
+        
+        if should_review and not args.review_only:
+            # 코드 리뷰와 커밋 메시지 생성은 서로 독립적이므로 동시에 수행
+            console.print("\n[bold cyan]🔍 AI 코드 리뷰 및 🤖 커밋 메시지 생성 중...[/bold cyan]")
             
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 console=console
             ) as progress:
-                task = progress.add_task(f"코드 분석 중 ({review_level} 모드)...", total=None)
+                review_task = progress.add_task(f"코드 분석 중 ({review_level} 모드)...", total=None)
+                generate_task = progress.add_task(f"{provider.upper()} API 호출 중...", total=None)
                 
-                try:
-                    reviewer = CodeReviewer(
-                        provider=provider,
-                        api_key=config.get_api_key(provider)
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    review_future = executor.submit(
+                        run_code_review, provider, api_key, files_to_commit, config_dict, review_level,
+                        session_key=session_key, cache=response_cache
                     )
-                    
-                    review_result = reviewer.review(
-                        files_to_commit,
-                        config.to_dict(),
-                        level=review_level
+                    generate_future = executor.submit(
+                        generate_commit_message, provider, api_key, files_to_commit, config_dict,
+                        cache=response_cache
                     )
                     
-                    progress.update(task, completed=True)
-                except Exception as e:
-                    console.print(f"\n[bold yellow]⚠️  코드 리뷰 실패: {e}[/bold yellow]")
-                    if not args.review_only:
-                        console.print("[yellow]리뷰 없이 계속 진행합니다...[/yellow]")
-                    else:
-                        sys.exit(1)
+                    future_tasks = {review_future: review_task, generate_future: generate_task}
+                    pending = set(future_tasks)
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            progress.update(future_tasks[future], completed=True)
+            
+            try:
+                review_result = review_future.result()
+            except Exception as e:
+                console.print(f"\n[bold yellow]⚠️  코드 리뷰 실패: {e}[/bold yellow]")
+                console.print("[yellow]리뷰 없이 계속 진행합니다...[/yellow]")
+            
+            try:
+                commit_message = generate_future.result()
+            except Exception as e:
+                console.print(f"\n[bold red]❌ 커밋 메시지 생성 실패: {e}[/bold red]")
+                raise _Exit(1)
             
             # 리뷰 결과 출력
             if review_result:
@@ -312,34 +582,45 @@ def main():
                     review_result['review'],
                     review_result['token_estimate']
                 )
-            
-            # 리뷰만 수행하는 모드
-            if args.review_only:
-                console.print("[cyan]리뷰만 수행했습니다. 커밋하지 않습니다.[/cyan]")
-                sys.exit(0)
         
-        # AI 커밋 메시지 생성
-        console.print("\n[bold blue]🤖 AI 커밋 메시지 생성 중...[/bold blue]")
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"{provider.upper()} API 호출 중...", total=None)
+        elif should_review:
+            # 리뷰만 수행하는 모드 (응답을 스트리밍으로 바로 출력)
+            console.print("\n[bold cyan]🔍 AI 코드 리뷰 수행 중...[/bold cyan]")
             
             try:
-                generator = CommitMessageGenerator(
-                    provider=provider,
-                    api_key=config.get_api_key(provider)
+                with live_panel(f"🔍 AI 코드 리뷰 ({review_level} 모드)", "cyan") as on_token:
+                    review_result = run_code_review(
+                        provider, api_key, files_to_commit, config_dict, review_level,
+                        on_token=on_token, session_key=session_key, cache=response_cache
+                    )
+            except Exception as e:
+                console.print(f"\n[bold yellow]⚠️  코드 리뷰 실패: {e}[/bold yellow]")
+                raise _Exit(1)
+            
+            # 리뷰 결과 출력
+            if review_result:
+                console.print()
+                print_code_review(
+                    review_result['review'],
+                    review_result['token_estimate']
                 )
-                
-                commit_message = generator.generate(files_to_commit, config.to_dict())
-                
-                progress.update(task, completed=True)
+            
+            console.print("[cyan]리뷰만 수행했습니다. 커밋하지 않습니다.[/cyan]")
+            raise _Exit(0)
+        
+        else:
+            # AI 커밋 메시지 생성 (토큰이 도착하는 대로 출력)
+            console.print("\n[bold blue]🤖 AI 커밋 메시지 생성 중...[/bold blue]")
+            
+            try:
+                with live_panel(f"🤖 {provider.upper()} 응답 수신 중...", "green") as on_token:
+                    commit_message = generate_commit_message(
+                        provider, api_key, files_to_commit, config_dict,
+                        on_token=on_token, cache=response_cache
+                    )
             except Exception as e:
                 console.print(f"\n[bold red]❌ 커밋 메시지 생성 실패: {e}[/bold red]")
-                sys.exit(1)
+                raise _Exit(1)
         
         # 커밋 메시지 출력
         console.print()
@@ -348,12 +629,14 @@ def main():
         # Dry run 모드
         if args.dry_run:
             console.print("\n[yellow]🔍 Dry-run 모드: 커밋하지 않습니다.[/yellow]")
-            sys.exit(0)
+            raise _Exit(0)
         
         # 커밋 확인
         if args.auto_yes:
             do_commit = True
         else:
+            from rich.prompt import Prompt
+            
             console.print()
             choice = Prompt.ask(
                 "이 메시지로 커밋하시겠습니까?",
@@ -362,23 +645,12 @@ def main():
             )
             
             if choice == "e":
-                # 메시지 편집
-                console.print("\n[cyan]커밋 메시지를 입력하세요 (빈 줄로 끝):[/cyan]")
-                lines = []
-                while True:
-                    try:
-                        line = input()
-                        if line == "" and lines:
-                            break
-                        lines.append(line)
-                    except EOFError:
-                        break
-                
-                commit_message = "\n".join(lines)
+                # 메시지 편집 ($EDITOR 또는 표준 입력)
+                commit_message = edit_commit_message(commit_message)
                 
-                if not commit_message.strip():
+                if not commit_message:
                     console.print("[red]커밋 메시지가 비어있습니다. 커밋을 취소합니다.[/red]")
-                    sys.exit(1)
+                    raise _Exit(1)
                 
                 do_commit = True
             elif choice == "y":
@@ -394,20 +666,28 @@ def main():
                 console.print(f"[dim]{commit.message.strip()}[/dim]")
             except Exception as e:
                 console.print(f"\n[bold red]❌ 커밋 실패: {e}[/bold red]")
-                sys.exit(1)
+                raise _Exit(1)
         else:
             console.print("\n[yellow]커밋이 취소되었습니다.[/yellow]")
-            sys.exit(0)
+            raise _Exit(0)
     
     except KeyboardInterrupt:
         console.print("\n\n[yellow]사용자에 의해 중단되었습니다.[/yellow]")
-        sys.exit(130)
+        raise _Exit(130)
     except Exception as e:
         console.print(f"\n[bold red]❌ 오류 발생: {e}[/bold red]")
         if args.verbose:
             import traceback
             console.print(traceback.format_exc())
-        sys.exit(1)
+        raise _Exit(1)
+    finally:
+        # 어떤 경로로 종료하든 저장소 핸들과 HTTP 연결 정리
+        if analyzer is not None:
+            analyzer.close()
+        # 예열 중인 클라이언트가 정리 이후에 등록되지 않도록 먼저 기다림
+        if warm_up is not None:
+            warm_up.join()
+        close_clients()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+"""
+규칙 기반 프롬프트 압축 ("caveman" 압축)
+LLM 호출 전에 공손한 표현, 군더더기 문구, 중복 공백을 정규식으로 제거해 입력 토큰을 줄입니다.
+정적 프롬프트 템플릿(prompt_templates)에만 적용합니다. 압축된 diff에는 식별자, 시그니처,
+이전 리뷰 등 바꾸면 안 되는 텍스트가 섞여 있으므로 적용하지 않습니다.
+코드 블록(```)과 diff 라인(+/-로 시작하는 줄)은 그대로 둡니다.
+"""
+
+import re
+
+
+# 순서대로 적용되는 치환 규칙
+_RULES = [
+    (re.compile(r'(?i)\bplease\b[ \t]*'), ''),
+    (re.compile(r'(?i)\bcould you\b[ \t]*'), ''),
+    (re.compile(r'(?i)\bprovide a detailed\b'), 'provide'),
+    (re.compile(r'(?i)\bit (?:seems|appears) (?:like|that)\b[ \t]*'), ''),
+    # 줄 중간의 연속 공백만 축약 (들여쓰기는 코드 구조이므로 유지)
+    (re.compile(r'(?<=\S)(?:[ \t]{2,}|\t)'), ' '),
+    (re.compile(r' +$', re.M), ''),
+    (re.compile(r'\n{3,}'), '\n\n'),
+]
+
+# 압축하지 않을 구간 (펜스 코드 블록, diff 라인)
+_PROTECTED_RE = re.compile(r'(```.*?```|^[ \t]*[+-][^\n]*$)', re.S | re.M)
+
+
+def compress(text: str) -> str:
+    """보호 구간을 제외한 텍스트에 압축 규칙 적용"""
+    if not text:
+        return text
+
+    # split 결과: 짝수 인덱스는 일반 텍스트, 홀수 인덱스는 보호 구간
+    parts = _PROTECTED_RE.split(text)
+    for i in range(0, len(parts), 2):
+        segment = parts[i]
+        for pattern, replacement in _RULES:
+            segment = pattern.sub(replacement, segment)
+        parts[i] = segment
+
+    return ''.join(parts)
@@ -4,9 +4,176 @@ AI 기반 코드 리뷰어
 """
 
 import os
-from typing import List, Dict, Optional
+import re
+import ast
+import math
+import heapq
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator, List, Dict, Optional
 from abc import ABC, abstractmethod
-from git_analyzer import FileChange
+from response_cache import ResponseCache, DEFAULT_CACHE_DIR, dumps, loads
+from prompt_templates import build_prompt
+
+if TYPE_CHECKING:
+    # 타입 힌트 전용 (GitPython import 비용을 CLI 시작 시점에서 제거)
+    from git_analyzer import FileChange
+
+
+# 리뷰 시스템 프롬프트 (모든 프로바이더 공통)
+REVIEW_SYSTEM_PROMPT = "You are an expert code reviewer. Provide concise, actionable feedback."
+
+
+# 최대 토큰 자동 조절 시 하한 (한국어 리뷰가 중간에 잘리지 않도록)
+MIN_REVIEW_TOKENS = 120
+
+# 파일 관련도 평가용 질의 (버그/보안/성능 관련 용어, BM25 점수 계산에 사용)
+REVIEW_QUERY = (
+    "error exception raise throw catch except null none undefined bug fix "
+    "auth token password secret key permission security sql query exec eval "
+    "lock thread async await timeout retry cache memory loop performance"
+).split()
+
+# quick 리뷰에서 중요한 라인이 있는지 확인할 때 파일당 검사하는 변경 라인 수
+SIGNAL_SCAN_LINES = 200
+# 중요한 변경이 없을 때의 리뷰 결과 (API 호출 생략)
+NO_SIGNAL_REVIEW = "✅ 중요한 로직 변경 없음"
+
+# 반복 리뷰에서 바뀌지 않은 파일의 이전 리뷰를 함께 보낼 때의 머리말 (새 리뷰가 모든 파일을 다루도록)
+PRIOR_REVIEW_HEADER = (
+    "[prior review - carry over findings that still apply to the unchanged files below, "
+    "so this review covers every file]"
+)
+
+# 이 수 이상의 파일이 바뀌면 관련도 낮은 파일은 한 줄 요약(시그니처만)으로 대체
+STUB_MIN_FILES = 6
+# 전체 내용으로 보낼 파일 비율 (나머지는 요약)
+FULL_FILE_RATIO = 0.7
+
+# 이 수를 넘는 파일이 바뀌면 파일별 압축을 스레드 풀에서 병렬 처리
+PARALLEL_MIN_FILES = 20
+
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+_INSERTIONS = attrgetter('insertions')
+_DELETIONS = attrgetter('deletions')
+
+# diff 라인 분류용 정규식 (줄 단위 startswith/strip 반복 대신 한 번에 스캔)
+_ADD_RE = re.compile(r'^\+(?!\+\+)(.*)$', re.M)
+_DEL_RE = re.compile(r'^-(?!--)(.*)$', re.M)
+_CHANGED_RE = re.compile(r'^(?:\+(?!\+\+)|-(?!--))(.*)$', re.M)
+# 리뷰에 의미 없는 라인 (import, 주석, 괄호만 있는 줄 등) - 대소문자 무시 접두부
+_SKIP_RE = re.compile(r'import |from |#|//|/\*|\*/|[{}()\[\];]|"""|\'\'\'|pass\b|console\.log', re.I)
+# 중요한 라인 (정의, 제어문, 대입 등)
+_IMPORTANT_RE = re.compile(r'def |class |function |return |if |else|for |while |try|catch|=|await |async |@')
+# 파일 우선순위 판단 (소문자 경로 기준 부분 문자열)
+_LOW_PRIORITY_RE = re.compile(
+    r'test_|_test\.|\.test\.|spec\.|config\.|setup\.|requirements\.'
+    r'|\.md|\.txt|\.ya?ml|\.json|migration|__init__'
+)
+_HIGH_PRIORITY_RE = re.compile(r'service|controller|api|model|handler|middleware|auth|security')
+# 함수/클래스 시그니처 키워드
+_SIGNATURE_RE = re.compile(r'def |class |function |const |let |var |public |private |protected |async |@')
+
+
+@lru_cache(maxsize=1)
+def _compress_pool():
+    """파일별 diff 압축용 스레드 풀 (큰 변경에서 처음 쓸 때 한 번만 생성)"""
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='diff-compress')
+
+
+@lru_cache(maxsize=None)
+def _openai_sdk():
+    """openai 모듈 (선택된 프로바이더에서 처음 쓸 때 한 번만 import)"""
+    import openai
+    return openai
+
+
+@lru_cache(maxsize=None)
+def _anthropic_sdk():
+    """anthropic 모듈 (선택된 프로바이더에서 처음 쓸 때 한 번만 import)"""
+    import anthropic
+    return anthropic
+
+
+@lru_cache(maxsize=None)
+def _genai_sdk():
+    """google.generativeai 모듈 (선택된 프로바이더에서 처음 쓸 때 한 번만 import)"""
+    import google.generativeai as genai
+    return genai
+
+
+@lru_cache(maxsize=8)
+def _get_encoder(model: str):
+    """모델별 tiktoken 인코더 (tiktoken이 없거나 로드에 실패하면 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # OpenAI 이외 모델(Claude, Gemini 등)은 범용 인코딩으로 근사
+        try:
+            return tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            return None
+    except Exception:
+        # 인코딩 파일 다운로드 실패 등
+        return None
+
+
+@lru_cache(maxsize=64)
+def estimate_tokens(text: str, model: str = '') -> int:
+    """토큰 수 추정 (tiktoken이 있으면 실제 인코딩, 없으면 평균 4자 = 1토큰)"""
+    encoder = _get_encoder(model or 'gpt-4')
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def bm25_scores(documents: List[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """BM25 점수 계산 (documents: 토큰 리스트 목록)"""
+    if not documents:
+        return []
+    
+    avg_len = sum(len(doc) for doc in documents) / len(documents) or 1
+    query_terms = set(query)
+    
+    # 문서 빈도
+    doc_freq = {term: 0 for term in query_terms}
+    term_counts = []
+    for doc in documents:
+        counts = {}
+        for token in doc:
+            if token in query_terms:
+                counts[token] = counts.get(token, 0) + 1
+        for term in counts:
+            doc_freq[term] += 1
+        term_counts.append(counts)
+    
+    n = len(documents)
+    idf = {term: math.log((n - df + 0.5) / (df + 0.5) + 1) for term, df in doc_freq.items()}
+    
+    scores = []
+    for doc, counts in zip(documents, term_counts):
+        norm = k1 * (1 - b + b * len(doc) / avg_len)
+        scores.append(sum(
+            idf[term] * tf * (k1 + 1) / (tf + norm)
+            for term, tf in counts.items()
+        ))
+    return scores
+
+
+def _print_token(text: str) -> None:
+    """스트리밍 토큰을 줄바꿈 없이 즉시 출력"""
+    print(text, end='', flush=True)
 
 
 class ReviewLevel:
@@ -23,17 +190,62 @@ class AIReviewProvider(ABC):
     def review_code(self, compressed_diff: str, level: str, config: dict) -> str:
         """코드 리뷰 수행"""
         pass
+    
+    def review_code_stream(self, compressed_diff: str, level: str, config: dict) -> Iterator[str]:
+        """코드 리뷰 스트리밍 수행 (기본: 전체 응답을 한 번에 반환)"""
+        yield self.review_code(compressed_diff, level, config)
+    
+    async def review_code_async(self, compressed_diff: str, level: str, config: dict) -> str:
+        """비동기 코드 리뷰 수행 (기본: 동기 호출을 스레드에서 실행)"""
+        import asyncio
+        # asyncio.to_thread는 3.9+ → 기본 스레드 풀 executor 직접 사용
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.review_code, compressed_diff, level, config)
+    
+    async def review_code_astream(self, compressed_diff: str, level: str, config: dict) -> AsyncIterator[str]:
+        """비동기 스트리밍 코드 리뷰 (기본: 비동기 호출 결과를 한 번에 반환)"""
+        yield await self.review_code_async(compressed_diff, level, config)
+    
+    async def aclose(self) -> None:
+        """비동기 클라이언트 정리 (이벤트 루프가 끝나기 전에 호출)"""
+        pass
+    
+    def _build_prompt(self, compressed_diff: str, level: str) -> str:
+        """리뷰 프롬프트 생성"""
+        return build_prompt(level, compressed_diff)
+    
+    def _get_max_tokens(self, level: str, config: dict, diff_tokens: Optional[int] = None) -> int:
+        """
+        레벨별 최대 토큰 수
+        
+        diff_tokens가 주어지면 압축 diff 크기(약 1/4)에 맞춰 기본값의 0.5~2배 범위에서 조절
+        (review.auto_max_tokens: false면 고정값 사용)
+        """
+        review_config = config.get('review', {})
+        
+        if level == ReviewLevel.QUICK:
+            base = review_config.get('max_tokens_quick', 150)
+        elif level == ReviewLevel.DETAILED:
+            base = review_config.get('max_tokens_detailed', 800)
+        else:
+            base = review_config.get('max_tokens_normal', 400)
+        
+        if diff_tokens is None or not review_config.get('auto_max_tokens', True):
+            return base
+        floor = max(base // 2, min(base, MIN_REVIEW_TOKENS))
+        return max(floor, min(diff_tokens // 4, base * 2))
 
 
 class OpenAIReviewProvider(AIReviewProvider):
     """OpenAI 리뷰 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client=None):
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
+            self.client = client or _openai_sdk().OpenAI(api_key=api_key)
         except ImportError:
             raise ImportError("OpenAI 라이브러리가 설치되지 않았습니다.")
+        self.api_key = api_key
+        self.async_client = None
     
     def review_code(self, compressed_diff: str, level: str, config: dict) -> str:
         """OpenAI를 사용하여 코드 리뷰"""
@@ -41,7 +253,7 @@ class OpenAIReviewProvider(AIReviewProvider):
         
         model = config.get('ai', {}).get('model', 'gpt-4')
         temperature = config.get('review', {}).get('temperature', 0.2)
-        max_tokens = self._get_max_tokens(level, config)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
         
         try:
             response = self.client.chat.completions.create(
@@ -49,7 +261,7 @@ class OpenAIReviewProvider(AIReviewProvider):
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert code reviewer. Provide concise, actionable feedback."
+                        "content": REVIEW_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -64,100 +276,132 @@ class OpenAIReviewProvider(AIReviewProvider):
         except Exception as e:
             raise RuntimeError(f"OpenAI API 호출 실패: {e}")
     
-    def _build_prompt(self, compressed_diff: str, level: str) -> str:
-        """리뷰 프롬프트 생성"""
-        if level == ReviewLevel.QUICK:
-            return self._quick_review_prompt(compressed_diff)
-        elif level == ReviewLevel.DETAILED:
-            return self._detailed_review_prompt(compressed_diff)
-        else:
-            return self._normal_review_prompt(compressed_diff)
-    
-    def _quick_review_prompt(self, diff: str) -> str:
-        """간단 리뷰 프롬프트 (토큰 최소화)"""
-        return f"""Quick code review - ONLY report critical issues:
-
-Code changes:
-{diff}
-
-Focus on:
-❌ Bugs (null pointer, logic errors)
-⚠️  Security issues
-🔥 Performance problems
-
-Format (Korean):
-- Use ✅/⚠️/❌ symbols
-- Max 3 items
-- Be specific and brief
-
-If no issues: "✅ 문제 없음"
-"""
-    
-    def _normal_review_prompt(self, diff: str) -> str:
-        """일반 리뷰 프롬프트"""
-        return f"""Code review - balanced detail:
-
-Code changes:
-{diff}
-
-Review:
-❌ Critical: bugs, security
-⚠️  Warning: potential issues, edge cases
-💡 Suggestion: code quality, naming
-
-Format (Korean):
-- Group by severity
-- Be specific with line context
-- Max 5-7 items total
-
-If mostly good: "✅ 전반적으로 양호합니다" + any warnings
-"""
+    def review_code_stream(self, compressed_diff: str, level: str, config: dict) -> Iterator[str]:
+        """OpenAI 스트리밍 응답으로 코드 리뷰"""
+        prompt = self._build_prompt(compressed_diff, level)
+        
+        model = config.get('ai', {}).get('model', 'gpt-4')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": REVIEW_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
     
-    def _detailed_review_prompt(self, diff: str) -> str:
-        """상세 리뷰 프롬프트"""
-        return f"""Detailed code review:
-
-Code changes:
-{diff}
-
-Analyze:
-🐛 Bugs & Logic errors
-🔒 Security vulnerabilities
-⚡ Performance issues
-🏗️  Architecture & design patterns
-📝 Code quality & readability
-✨ Best practices
-
-Format (Korean):
-- Organized by category
-- Specific examples with context
-- Actionable recommendations
-
-Provide thorough analysis.
-"""
+    async def review_code_async(self, compressed_diff: str, level: str, config: dict) -> str:
+        """AsyncOpenAI를 사용하여 코드 리뷰 (여러 리뷰를 동시에 요청할 때 사용)"""
+        prompt = self._build_prompt(compressed_diff, level)
+        
+        model = config.get('ai', {}).get('model', 'gpt-4')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            if self.async_client is None:
+                self.async_client = _openai_sdk().AsyncOpenAI(api_key=self.api_key)
+            
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": REVIEW_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
     
-    def _get_max_tokens(self, level: str, config: dict) -> int:
-        """레벨별 최대 토큰 수"""
-        review_config = config.get('review', {})
+    async def review_code_astream(self, compressed_diff: str, level: str, config: dict) -> AsyncIterator[str]:
+        """AsyncOpenAI 스트리밍 응답으로 코드 리뷰"""
+        prompt = self._build_prompt(compressed_diff, level)
         
-        if level == ReviewLevel.QUICK:
-            return review_config.get('max_tokens_quick', 150)
-        elif level == ReviewLevel.DETAILED:
-            return review_config.get('max_tokens_detailed', 800)
-        else:
-            return review_config.get('max_tokens_normal', 400)
+        model = config.get('ai', {}).get('model', 'gpt-4')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            if self.async_client is None:
+                self.async_client = _openai_sdk().AsyncOpenAI(api_key=self.api_key)
+            
+            stream = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": REVIEW_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
+    
+    async def aclose(self) -> None:
+        """AsyncOpenAI 클라이언트 정리"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
 
 
 class GeminiReviewProvider(AIReviewProvider):
     """Google Gemini 리뷰 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client=None):
         try:
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            self.genai = genai
+            genai = _genai_sdk()
+            if client is None:
+                genai.configure(api_key=api_key)
+            self.genai = client or genai
         except ImportError:
             raise ImportError("Google Generative AI 라이브러리가 설치되지 않았습니다.")
+        self._models = {}
+    
+    def _get_model(self, model_name: str):
+        """모델 객체 재사용 (모델 이름별로 한 번만 생성)"""
+        model = self._models.get(model_name)
+        if model is None:
+            model = self.genai.GenerativeModel(model_name, system_instruction=REVIEW_SYSTEM_PROMPT)
+            self._models[model_name] = model
+        return model
     
     def review_code(self, compressed_diff: str, level: str, config: dict) -> str:
         """Gemini를 사용하여 코드 리뷰"""
@@ -165,10 +409,10 @@ class GeminiReviewProvider(AIReviewProvider):
         
         model_name = config.get('ai', {}).get('model', 'gemini-2.0-flash')
         temperature = config.get('review', {}).get('temperature', 0.2)
-        max_tokens = self._get_max_tokens(level, config)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model_name))
         
         try:
-            model = self.genai.GenerativeModel(model_name)
+            model = self._get_model(model_name)
             
             generation_config = {
                 "temperature": temperature,
@@ -184,118 +428,115 @@ class GeminiReviewProvider(AIReviewProvider):
         except Exception as e:
             raise RuntimeError(f"Gemini API 호출 실패: {e}")
     
-    def _build_prompt(self, compressed_diff: str, level: str) -> str:
-        """리뷰 프롬프트 생성"""
-        if level == ReviewLevel.QUICK:
-            return self._quick_review_prompt(compressed_diff)
-        elif level == ReviewLevel.DETAILED:
-            return self._detailed_review_prompt(compressed_diff)
-        else:
-            return self._normal_review_prompt(compressed_diff)
-    
-    def _quick_review_prompt(self, diff: str) -> str:
-        """간단 리뷰 프롬프트"""
-        return f"""Quick code review - ONLY report critical issues:
-
-Code changes:
-{diff}
-
-Focus on:
-❌ Bugs (null pointer, logic errors)
-⚠️  Security issues
-🔥 Performance problems
-
-Format (Korean):
-- Use ✅/⚠️/❌ symbols
-- Max 3 items
-- Be specific and brief
-
-If no issues: "✅ 문제 없음"
-"""
-    
-    def _normal_review_prompt(self, diff: str) -> str:
-        """일반 리뷰 프롬프트"""
-        return f"""Code review - balanced detail:
-
-Code changes:
-{diff}
-
-Review:
-❌ Critical: bugs, security
-⚠️  Warning: potential issues, edge cases
-💡 Suggestion: code quality, naming
-
-Format (Korean):
-- Group by severity
-- Be specific with line context
-- Max 5-7 items total
-
-If mostly good: "✅ 전반적으로 양호합니다" + any warnings
-"""
+    def review_code_stream(self, compressed_diff: str, level: str, config: dict) -> Iterator[str]:
+        """Gemini 스트리밍 응답으로 코드 리뷰"""
+        prompt = self._build_prompt(compressed_diff, level)
+        
+        model_name = config.get('ai', {}).get('model', 'gemini-2.0-flash')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model_name))
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            
+            response = model.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+            
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
     
-    def _detailed_review_prompt(self, diff: str) -> str:
-        """상세 리뷰 프롬프트"""
-        return f"""Detailed code review:
-
-Code changes:
-{diff}
-
-Analyze:
-🐛 Bugs & Logic errors
-🔒 Security vulnerabilities
-⚡ Performance issues
-🏗️  Architecture & design patterns
-📝 Code quality & readability
-✨ Best practices
-
-Format (Korean):
-- Organized by category
-- Specific examples with context
-- Actionable recommendations
-
-Provide thorough analysis.
-"""
+    async def review_code_async(self, compressed_diff: str, level: str, config: dict) -> str:
+        """Gemini 비동기 API로 코드 리뷰"""
+        prompt = self._build_prompt(compressed_diff, level)
+        
+        model_name = config.get('ai', {}).get('model', 'gemini-2.0-flash')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model_name))
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config
+            )
+            
+            return response.text.strip()
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
     
-    def _get_max_tokens(self, level: str, config: dict) -> int:
-        """레벨별 최대 토큰 수"""
-        review_config = config.get('review', {})
+    async def review_code_astream(self, compressed_diff: str, level: str, config: dict) -> AsyncIterator[str]:
+        """Gemini 비동기 스트리밍 응답으로 코드 리뷰"""
+        prompt = self._build_prompt(compressed_diff, level)
         
-        if level == ReviewLevel.QUICK:
-            return review_config.get('max_tokens_quick', 150)
-        elif level == ReviewLevel.DETAILED:
-            return review_config.get('max_tokens_detailed', 800)
-        else:
-            return review_config.get('max_tokens_normal', 400)
+        model_name = config.get('ai', {}).get('model', 'gemini-2.0-flash')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model_name))
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+            
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
 
 
 class AnthropicReviewProvider(AIReviewProvider):
     """Anthropic (Claude) 리뷰 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client=None):
         try:
-            import anthropic
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = client or _anthropic_sdk().Anthropic(api_key=api_key)
         except ImportError:
             raise ImportError("Anthropic 라이브러리가 설치되지 않았습니다.")
+        self.api_key = api_key
+        self.async_client = None
     
     def review_code(self, compressed_diff: str, level: str, config: dict) -> str:
         """Claude를 사용하여 코드 리뷰"""
-        prompt = self._build_prompt(compressed_diff, level)
-        
         model = config.get('ai', {}).get('model', 'claude-3-sonnet-20240229')
         temperature = config.get('review', {}).get('temperature', 0.2)
-        max_tokens = self._get_max_tokens(level, config)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
         
         try:
             response = self.client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system="You are an expert code reviewer. Provide concise, actionable feedback.",
+                system=REVIEW_SYSTEM_PROMPT,
                 messages=[
                     {
                         "role": "user",
-                        "content": prompt
+                        "content": self._build_prompt(compressed_diff, level)
                     }
                 ]
             )
@@ -304,98 +545,250 @@ class AnthropicReviewProvider(AIReviewProvider):
         except Exception as e:
             raise RuntimeError(f"Anthropic API 호출 실패: {e}")
     
-    def _build_prompt(self, compressed_diff: str, level: str) -> str:
-        """리뷰 프롬프트 생성"""
-        if level == ReviewLevel.QUICK:
-            return self._quick_review_prompt(compressed_diff)
-        elif level == ReviewLevel.DETAILED:
-            return self._detailed_review_prompt(compressed_diff)
-        else:
-            return self._normal_review_prompt(compressed_diff)
+    def review_code_stream(self, compressed_diff: str, level: str, config: dict) -> Iterator[str]:
+        """Claude 스트리밍 응답으로 코드 리뷰"""
+        model = config.get('ai', {}).get('model', 'claude-3-sonnet-20240229')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            with self.client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=REVIEW_SYSTEM_PROMPT,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": self._build_prompt(compressed_diff, level)
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API 호출 실패: {e}")
     
-    def _quick_review_prompt(self, diff: str) -> str:
-        """간단 리뷰 프롬프트"""
-        return f"""Quick code review - ONLY report critical issues:
-
-Code changes:
-{diff}
-
-Focus on:
-❌ Bugs (null pointer, logic errors)
-⚠️  Security issues
-🔥 Performance problems
-
-Format (Korean):
-- Use ✅/⚠️/❌ symbols
-- Max 3 items
-- Be specific and brief
-
-If no issues: "✅ 문제 없음"
-"""
+    async def review_code_async(self, compressed_diff: str, level: str, config: dict) -> str:
+        """AsyncAnthropic을 사용하여 코드 리뷰 (여러 리뷰를 동시에 요청할 때 사용)"""
+        model = config.get('ai', {}).get('model', 'claude-3-sonnet-20240229')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            if self.async_client is None:
+                self.async_client = _anthropic_sdk().AsyncAnthropic(api_key=self.api_key)
+            
+            response = await self.async_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=REVIEW_SYSTEM_PROMPT,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": self._build_prompt(compressed_diff, level)
+                    }
+                ]
+            )
+            
+            return response.content[0].text.strip()
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API 호출 실패: {e}")
     
-    def _normal_review_prompt(self, diff: str) -> str:
-        """일반 리뷰 프롬프트"""
-        return f"""Code review - balanced detail:
-
-Code changes:
-{diff}
-
-Review:
-❌ Critical: bugs, security
-⚠️  Warning: potential issues, edge cases
-💡 Suggestion: code quality, naming
+    async def review_code_astream(self, compressed_diff: str, level: str, config: dict) -> AsyncIterator[str]:
+        """AsyncAnthropic 스트리밍 응답으로 코드 리뷰"""
+        model = config.get('ai', {}).get('model', 'claude-3-sonnet-20240229')
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        max_tokens = self._get_max_tokens(level, config, estimate_tokens(compressed_diff, model))
+        
+        try:
+            if self.async_client is None:
+                self.async_client = _anthropic_sdk().AsyncAnthropic(api_key=self.api_key)
+            
+            async with self.async_client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=REVIEW_SYSTEM_PROMPT,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": self._build_prompt(compressed_diff, level)
+                    }
+                ]
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API 호출 실패: {e}")
+    
+    async def aclose(self) -> None:
+        """AsyncAnthropic 클라이언트 정리"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
 
-Format (Korean):
-- Group by severity
-- Be specific with line context
-- Max 5-7 items total
 
-If mostly good: "✅ 전반적으로 양호합니다" + any warnings
-"""
+class CompressedDiffCache:
+    """파일별 압축 결과 캐시 (diff 해시 기반 LRU, 디스크에 JSON 하나로 저장)
+    
+    여러 번 실행하는 동안 바뀌지 않은 파일은 다시 압축하지 않습니다.
+    """
+    
+    def __init__(self, path=None, max_entries: int = 1024):
+        self.path = path or DEFAULT_CACHE_DIR / 'diff_cache.json'
+        self.max_entries = max_entries
+        self._entries: Optional[OrderedDict] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(diff: str, level: str, change_type: str, path: str) -> str:
+        """캐시 키 (diff 해시 + 압축 방식에 영향을 주는 값)"""
+        digest = hashlib.blake2b(diff.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+        kind = 'py' if path.endswith('.py') else ''
+        return f"{digest}|{level}|{change_type}|{kind}"
+    
+    def _load(self) -> OrderedDict:
+        if self._entries is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._entries = OrderedDict(loads(f.read()))
+            except (OSError, ValueError, TypeError):
+                self._entries = OrderedDict()
+        return self._entries
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entries = self._load()
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
     
-    def _detailed_review_prompt(self, diff: str) -> str:
-        """상세 리뷰 프롬프트"""
-        return f"""Detailed code review:
+    def save(self) -> None:
+        """변경된 경우에만 디스크에 저장 (실패는 무시)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.write(dumps(self._entries))
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except (OSError, TypeError, ValueError):
+                pass
 
-Code changes:
-{diff}
 
-Analyze:
-🐛 Bugs & Logic errors
-🔒 Security vulnerabilities
-⚡ Performance issues
-🏗️  Architecture & design patterns
-📝 Code quality & readability
-✨ Best practices
+_diff_cache = CompressedDiffCache()
 
-Format (Korean):
-- Organized by category
-- Specific examples with context
-- Actionable recommendations
 
-Provide thorough analysis.
-"""
+class ReviewSession:
+    """반복 리뷰 세션 (저장소 + 브랜치별 파일 diff 해시, 리뷰 레벨, 마지막 리뷰를 디스크에 저장)
     
-    def _get_max_tokens(self, level: str, config: dict) -> int:
-        """레벨별 최대 토큰 수"""
-        review_config = config.get('review', {})
-        
-        if level == ReviewLevel.QUICK:
-            return review_config.get('max_tokens_quick', 150)
-        elif level == ReviewLevel.DETAILED:
-            return review_config.get('max_tokens_detailed', 800)
-        else:
-            return review_config.get('max_tokens_normal', 400)
+    이전 리뷰 이후 diff가 바뀌지 않은 파일은 한 줄 표시로 대체하고, 이전 리뷰와 함께
+    바뀐 파일만 다시 보냅니다. 리뷰 레벨이 다르면 이전 세션을 사용하지 않습니다.
+    """
+    
+    MAX_SESSIONS = 64
+    
+    def __init__(self, key: str, path=None):
+        self.key = key
+        self.path = path or DEFAULT_CACHE_DIR / 'session.json'
+        self._sessions: Optional[dict] = None
+        self._pending: Dict[str, str] = {}
+        self._level: Optional[str] = None  # 마지막 split()의 리뷰 레벨
+        self.has_fresh = True  # 마지막 split()에서 바뀐 파일이 있었는지
+    
+    @staticmethod
+    def digest(change: "FileChange") -> str:
+        """파일 변경 해시 (변경 타입 + diff)"""
+        data = f"{change.change_type}\0{change.diff or ''}".encode('utf-8', errors='replace')
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _load(self) -> dict:
+        if self._sessions is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._sessions = dict(loads(f.read()))
+            except (OSError, ValueError, TypeError):
+                self._sessions = {}
+        return self._sessions
+    
+    def _entry(self) -> dict:
+        """현재 레벨로 저장된 세션 (레벨이 다르거나 리뷰가 없으면 빈 dict)"""
+        entry = self._load().get(self.key) or {}
+        if entry.get('level') != self._level or not entry.get('review'):
+            return {}
+        return entry
+    
+    @property
+    def last_review(self) -> Optional[str]:
+        """같은 레벨의 이전 리뷰 결과 (없으면 None)"""
+        return self._entry().get('review')
+    
+    def split(self, changes: List["FileChange"], level: Optional[str] = None) -> tuple:
+        """(다시 보낼 변경 목록, 바뀌지 않은 파일 경로 목록) - 새 해시는 commit() 때 반영"""
+        self._level = level
+        known = self._entry().get('files', {})
+        fresh, unchanged = [], []
+        for change in changes:
+            digest = self.digest(change)
+            self._pending[change.path] = digest
+            if known.get(change.path) == digest:
+                unchanged.append(change.path)
+            else:
+                fresh.append(change)
+        self.has_fresh = bool(fresh)
+        return fresh, unchanged
+    
+    def commit(self, review_text: str) -> None:
+        """리뷰 성공 후 이번 해시와 리뷰 결과를 세션에 저장 (실패는 무시)"""
+        sessions = self._load()
+        sessions.pop(self.key, None)
+        sessions[self.key] = {'files': self._pending, 'review': review_text, 'level': self._level}
+        while len(sessions) > self.MAX_SESSIONS:
+            sessions.pop(next(iter(sessions)))
+        self._pending = {}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps(sessions))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            pass
 
 
 class DiffCompressor:
     """Diff 압축기 - 토큰 사용량을 최소화"""
     
     @staticmethod
-    def compress(changes: List[FileChange], level: str) -> str:
-        """변경사항을 압축하여 핵심만 추출"""
-        compressed_parts = []
-        total_lines = sum(c.insertions + c.deletions for c in changes)
+    def compress(changes: List["FileChange"], level: str, session: Optional[ReviewSession] = None) -> str:
+        """변경사항을 압축하여 핵심만 추출 (session이 있으면 이전 리뷰 이후 바뀐 파일만)"""
+        if session is not None:
+            changes, unchanged = session.split(changes, level)
+            if unchanged:
+                # 바뀌지 않은 파일은 이전 리뷰에서 다뤘으므로 그 리뷰를 함께 보냄
+                parts = [PRIOR_REVIEW_HEADER, session.last_review, '']
+                parts.extend(f"[unchanged: {path} (see prior review)]" for path in unchanged)
+                if changes:
+                    parts.append(DiffCompressor.compress(changes, level))
+                return '\n'.join(parts)
+        
+        total_lines = sum(map(_INSERTIONS, changes)) + sum(map(_DELETIONS, changes))
         
         # 변경사항 크기에 따라 자동 조절
         if total_lines > 500 and level != ReviewLevel.DETAILED:
@@ -405,114 +798,175 @@ class DiffCompressor:
             # 중간 변경 + quick: 매우 간단하게
             return DiffCompressor._compress_minimal(changes)
         else:
-            # 일반적인 압축
-            return DiffCompressor._compress_smart(changes, level)
+            # 일반적인 압축 (파일별 압축 결과는 캐시에 저장)
+            result = DiffCompressor._compress_smart(changes, level)
+            _diff_cache.save()
+            return result
     
     @staticmethod
-    def _compress_summary(changes: List[FileChange]) -> str:
+    def has_signal(changes: List["FileChange"]) -> bool:
+        """리뷰할 만한 변경(중요한 추가/삭제 라인)이 하나라도 있는지 확인"""
+        is_important = DiffCompressor._is_important_line
+        for change in changes:
+            for match in islice(_CHANGED_RE.finditer(change.diff or ''), SIGNAL_SCAN_LINES):
+                if is_important(match.group(1).strip()):
+                    return True
+        return False
+    
+    @staticmethod
+    def _compress_summary(changes: List["FileChange"]) -> str:
         """대량 변경사항 요약"""
-        summary = "⚠️  대량 변경 감지 - 요약 리뷰\n\n"
+        parts = ["⚠️  대량 변경 감지 - 요약 리뷰\n\n"]
         
         by_type = {}
         for change in changes:
-            ext = change.path.split('.')[-1] if '.' in change.path else 'other'
+            ext = DiffCompressor._get_ext(change.path)
             if ext not in by_type:
                 by_type[ext] = []
             by_type[ext].append(change)
         
         for ext, files in by_type.items():
-            total_add = sum(f.insertions for f in files)
-            total_del = sum(f.deletions for f in files)
-            summary += f"📁 .{ext} 파일: {len(files)}개 (+{total_add}/-{total_del})\n"
+            total_add = sum(map(_INSERTIONS, files))
+            total_del = sum(map(_DELETIONS, files))
+            parts.append(f"📁 .{ext} 파일: {len(files)}개 (+{total_add}/-{total_del})\n")
             
-            # 가장 큰 변경사항 2개만
-            sorted_files = sorted(files, key=lambda f: f.insertions + f.deletions, reverse=True)
-            for f in sorted_files[:2]:
-                summary += f"  • {f.path} (+{f.insertions}/-{f.deletions})\n"
+            # 가장 큰 변경사항 2개만 (전체 정렬 없이)
+            for f in heapq.nlargest(2, files, key=lambda f: f.insertions + f.deletions):
+                parts.append(f"  • {f.path} (+{f.insertions}/-{f.deletions})\n")
         
-        return summary
+        return "".join(parts)
     
     @staticmethod
-    def _compress_minimal(changes: List[FileChange]) -> str:
+    def _compress_minimal(changes: List["FileChange"]) -> str:
         """최소 압축 (파일 목록과 주요 변경만)"""
-        result = "📝 변경 파일:\n"
+        parts = ["📝 변경 파일:\n"]
         
         for change in changes:
-            result += f"\n• {change.path} ({change.change_type}) +{change.insertions}/-{change.deletions}\n"
+            parts.append(f"\n• {change.path} ({change.change_type}) +{change.insertions}/-{change.deletions}\n")
             
             # 핵심 변경만 추출
             key_changes = DiffCompressor._extract_key_changes(change.diff, limit=5)
             if key_changes:
-                result += "  핵심 변경:\n"
-                for line in key_changes:
-                    result += f"    {line}\n"
+                parts.append("  핵심 변경:\n")
+                parts.extend(f"    {line}\n" for line in key_changes)
         
-        return result
+        return "".join(parts)
     
     @staticmethod
-    def _compress_smart(changes: List[FileChange], level: str) -> str:
+    def _compress_smart(changes: List["FileChange"], level: str) -> str:
         """스마트 압축 - 중요한 부분만"""
-        result = ""
+        # 파일이 많으면 관련도 상위 파일만 전체 압축, 나머지는 시그니처 요약
+        full_paths = None
+        if level != ReviewLevel.DETAILED and len(changes) >= STUB_MIN_FILES:
+            full_paths = DiffCompressor._select_relevant(changes)
         
-        for change in changes:
-            # 파일 우선순위
-            priority = DiffCompressor._get_file_priority(change.path)
-            
-            if priority == "low" and level == ReviewLevel.QUICK:
-                # 저우선순위 파일은 quick 모드에서 스킵
-                continue
-            
-            result += f"\n━━━ {change.path} ({change.change_type}) +{change.insertions}/-{change.deletions}\n"
-            
-            # diff 압축
-            if change.diff:
-                compressed_diff = DiffCompressor._compress_diff_content(
-                    change.diff,
-                    level,
-                    change.change_type
-                )
-                result += compressed_diff + "\n"
+        if len(changes) > PARALLEL_MIN_FILES:
+            # 원래 순서대로 결과를 모음
+            parts = _compress_pool().map(lambda change: DiffCompressor._compress_one(change, level, full_paths), changes)
+        else:
+            parts = (DiffCompressor._compress_one(change, level, full_paths) for change in changes)
+        
+        return "".join(parts)
+    
+    @staticmethod
+    def _compress_one(change: "FileChange", level: str, full_paths: Optional[set]) -> str:
+        """파일 하나의 압축 결과 (리뷰에서 제외되면 빈 문자열)"""
+        # 파일 우선순위
+        priority = DiffCompressor._get_file_priority(change.path)
+        
+        if priority == "low" and level == ReviewLevel.QUICK:
+            # 저우선순위 파일은 quick 모드에서 스킵
+            return ""
+        
+        if full_paths is not None and change.path not in full_paths:
+            return DiffCompressor._stub(change)
+        
+        header = f"\n━━━ {change.path} ({change.change_type}) +{change.insertions}/-{change.deletions}\n"
+        if not change.diff:
+            return header
         
-        return result
+        # diff 압축
+        compressed_diff = DiffCompressor._compress_diff_content_cached(
+            change.diff,
+            level,
+            change.change_type,
+            change.path
+        )
+        return f"{header}{compressed_diff}\n"
+    
+    @staticmethod
+    def _select_relevant(changes: List["FileChange"]) -> set:
+        """BM25(리뷰 질의 기준) + 파일 우선순위로 전체 내용을 보낼 파일 선택"""
+        documents = [_TOKEN_RE.findall((c.path + '\n' + (c.diff or '')).lower()) for c in changes]
+        scores = bm25_scores(documents, REVIEW_QUERY)
+        
+        priority_bonus = {"high": 1.0, "normal": 0.0, "low": -1.0}
+        ranked = sorted(
+            range(len(changes)),
+            key=lambda i: scores[i] + priority_bonus[DiffCompressor._get_file_priority(changes[i].path)],
+            reverse=True
+        )
+        
+        keep = math.ceil(len(changes) * FULL_FILE_RATIO)
+        return {changes[i].path for i in ranked[:keep]}
+    
+    @staticmethod
+    def _stub(change: "FileChange") -> str:
+        """관련도가 낮은 파일의 한 줄 요약 (시그니처만)"""
+        signatures = DiffCompressor._extract_signatures(
+            [match.group(1) for match in _ADD_RE.finditer(change.diff or '')]
+        )
+        stub = f"\n• {change.path} ({change.change_type}) +{change.insertions}/-{change.deletions}"
+        if signatures:
+            stub += ": " + "; ".join(sig[:60] for sig in signatures[:3])
+        return stub + "\n"
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_ext(path: str) -> str:
+        """파일 확장자 (없으면 'other')"""
+        return path.split('.')[-1] if '.' in path else 'other'
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _get_file_priority(path: str) -> str:
         """파일 우선순위 결정"""
-        # 낮은 우선순위
-        low_priority_patterns = [
-            'test_', '_test.', '.test.',
-            'spec.', '.spec.',
-            'config.', 'setup.', 'requirements.',
-            '.md', '.txt', '.yml', '.yaml', '.json',
-            'migration', '__init__'
-        ]
-        
         path_lower = path.lower()
-        for pattern in low_priority_patterns:
-            if pattern in path_lower:
-                return "low"
         
-        # 높은 우선순위 (API, 서비스, 모델 등)
-        high_priority_patterns = [
-            'service', 'controller', 'api', 'model',
-            'handler', 'middleware', 'auth', 'security'
-        ]
+        # 낮은 우선순위 (테스트, 설정, 문서 등)
+        if _LOW_PRIORITY_RE.search(path_lower):
+            return "low"
         
-        for pattern in high_priority_patterns:
-            if pattern in path_lower:
-                return "high"
+        # 높은 우선순위 (API, 서비스, 모델 등)
+        if _HIGH_PRIORITY_RE.search(path_lower):
+            return "high"
         
         return "normal"
     
     @staticmethod
-    def _compress_diff_content(diff: str, level: str, change_type: str) -> str:
+    def _compress_diff_content_cached(diff: str, level: str, change_type: str, path: str = '') -> str:
+        """_compress_diff_content 결과를 diff 해시 기준으로 캐시"""
+        key = CompressedDiffCache.make_key(diff, level, change_type, path)
+        compressed = _diff_cache.get(key)
+        if compressed is None:
+            compressed = DiffCompressor._compress_diff_content(diff, level, change_type, path)
+            _diff_cache.set(key, compressed)
+        return compressed
+    
+    @staticmethod
+    def _compress_diff_content(diff: str, level: str, change_type: str, path: str = '') -> str:
         """diff 내용 압축"""
-        lines = diff.split('\n')
         result = []
         
         # 새 파일은 시그니처만
         if change_type == 'A':
-            signatures = DiffCompressor._extract_signatures(lines)
+            signatures = None
+            if path.endswith('.py'):
+                # 파이썬 파일은 AST로 정확한 정의만 추출 (파싱 실패 시 정규식)
+                added = '\n'.join(m.group(1) for m in _ADD_RE.finditer(diff)) or diff
+                signatures = DiffCompressor._python_signatures(added)
+            if signatures is None:
+                signatures = DiffCompressor._extract_signatures(diff.split('\n'))
             if signatures:
                 result.append("새로운 정의:")
                 result.extend(signatures[:15 if level == ReviewLevel.DETAILED else 8])
@@ -522,20 +976,17 @@ class DiffCompressor:
                 result.extend(key_lines)
         else:
             # 수정/삭제 파일
-            additions = []
-            deletions = []
-            context_lines = []
-            
-            for i, line in enumerate(lines):
-                if line.startswith('+') and not line.startswith('+++'):
-                    clean_line = line[1:].strip()
-                    if DiffCompressor._is_important_line(clean_line):
-                        additions.append(f"+ {clean_line[:100]}")
-                        
-                elif line.startswith('-') and not line.startswith('---'):
-                    clean_line = line[1:].strip()
-                    if DiffCompressor._is_important_line(clean_line):
-                        deletions.append(f"- {clean_line[:100]}")
+            is_important = DiffCompressor._is_important_line
+            deletions = [
+                f"- {clean[:100]}"
+                for clean in (m.group(1).strip() for m in _DEL_RE.finditer(diff))
+                if is_important(clean)
+            ]
+            additions = [
+                f"+ {clean[:100]}"
+                for clean in (m.group(1).strip() for m in _ADD_RE.finditer(diff))
+                if is_important(clean)
+            ]
             
             # 제한
             max_lines = 20 if level == ReviewLevel.DETAILED else 10
@@ -554,32 +1005,58 @@ class DiffCompressor:
     def _extract_signatures(lines: List[str]) -> List[str]:
         """함수/클래스 시그니처 추출"""
         signatures = []
-        keywords = ['def ', 'class ', 'function ', 'const ', 'let ', 'var ',
-                   'public ', 'private ', 'protected ', 'async ', '@']
         
         for line in lines:
             clean = line.lstrip('+').strip()
-            if any(kw in clean for kw in keywords):
+            if _SIGNATURE_RE.search(clean):
                 if '(' in clean or 'class ' in clean:
                     signatures.append(clean[:120])
         
         return signatures
     
     @staticmethod
-    def _extract_key_changes(diff: str, limit: int = 10) -> List[str]:
-        """핵심 변경사항만 추출"""
-        lines = diff.split('\n')
-        key_lines = []
+    def _python_signatures(source: str) -> Optional[List[str]]:
+        """파이썬 소스에서 클래스/함수 시그니처 추출 (문법 오류면 None)"""
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return None
         
-        for line in lines:
-            if line.startswith('+') and not line.startswith('+++'):
-                clean = line[1:].strip()
-                if DiffCompressor._is_important_line(clean):
-                    key_lines.append(f"+ {clean[:100]}")
-                    if len(key_lines) >= limit:
-                        break
+        signatures = []
+        # ast.unparse는 3.9+ (이전 버전은 이름만 표시)
+        unparse = getattr(ast, 'unparse', None)
         
-        return key_lines
+        def base_name(base: ast.AST) -> str:
+            return unparse(base) if unparse else getattr(base, 'id', '...')
+        
+        def visit(node: ast.AST, depth: int) -> None:
+            for child in ast.iter_child_nodes(node):
+                indent = '  ' * depth
+                if isinstance(child, ast.ClassDef):
+                    bases = ', '.join(base_name(base) for base in child.bases)
+                    signatures.append(f"{indent}class {child.name}({bases})" if bases else f"{indent}class {child.name}")
+                    visit(child, depth + 1)
+                elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    args = child.args
+                    names = [a.arg for a in getattr(args, 'posonlyargs', []) + args.args]  # posonlyargs는 3.8+
+                    if args.vararg:
+                        names.append(f"*{args.vararg.arg}")
+                    names.extend(a.arg for a in args.kwonlyargs)
+                    if args.kwarg:
+                        names.append(f"**{args.kwarg.arg}")
+                    prefix = 'async def' if isinstance(child, ast.AsyncFunctionDef) else 'def'
+                    signatures.append(f"{indent}{prefix} {child.name}({', '.join(names)})"[:120])
+                    visit(child, depth + 1)
+        
+        visit(tree, 0)
+        return signatures
+    
+    @staticmethod
+    def _extract_key_changes(diff: str, limit: int = 10) -> List[str]:
+        """핵심 변경사항만 추출 (앞에서부터 최대 limit개)"""
+        is_important = DiffCompressor._is_important_line
+        added = (match.group(1).strip() for match in _ADD_RE.finditer(diff))
+        return [f"+ {clean[:100]}" for clean in islice(filter(is_important, added), limit)]
     
     @staticmethod
     def _is_important_line(line: str) -> bool:
@@ -587,37 +1064,30 @@ class DiffCompressor:
         if not line or len(line) < 3:
             return False
         
-        # 제외할 패턴
-        skip_patterns = [
-            'import ', 'from ', '#', '//', '/*', '*/',
-            '{', '}', '(', ')', '[', ']', ';',
-            '"""', "'''", 'pass', 'console.log'
-        ]
-        
-        line_lower = line.lower().strip()
-        for pattern in skip_patterns:
-            if line_lower.startswith(pattern) or line_lower == pattern:
-                return False
+        # 제외할 패턴 (import, 주석, 괄호 등으로 시작하는 라인)
+        if _SKIP_RE.match(line):
+            return False
         
         # 중요한 패턴
-        important_patterns = [
-            'def ', 'class ', 'function ', 'return ',
-            'if ', 'else', 'for ', 'while ', 'try', 'catch',
-            '=', 'await ', 'async ', '@'
-        ]
-        
-        return any(pattern in line for pattern in important_patterns)
+        return _IMPORTANT_RE.search(line) is not None
 
 
 class CodeReviewer:
     """코드 리뷰어 메인 클래스"""
     
-    def __init__(self, provider: str = "openai", api_key: Optional[str] = None):
+    def __init__(self, provider: str = "openai", api_key: Optional[str] = None, client=None,
+                 cache: Optional[ResponseCache] = None):
         """
         Args:
             provider: 'openai', 'anthropic', 또는 'gemini'
             api_key: API 키 (None이면 환경 변수에서 가져옴)
+            client: 미리 생성된 SDK 클라이언트 (None이면 새로 생성)
+            cache: 리뷰 응답 캐시 (None이면 기본 디스크 캐시)
         """
+        self.provider_name = provider
+        self.cache = cache if cache is not None else ResponseCache()
+        self.stats = {'cache_hits': 0, 'cache_misses': 0, 'skipped': 0}
+        
         if api_key is None:
             if provider == "openai":
                 api_key = os.getenv("OPENAI_API_KEY")
@@ -635,19 +1105,22 @@ class CodeReviewer:
                 raise ValueError(f"지원하지 않는 provider: {provider}")
         
         if provider == "openai":
-            self.provider = OpenAIReviewProvider(api_key)
+            self.provider = OpenAIReviewProvider(api_key, client)
         elif provider == "anthropic":
-            self.provider = AnthropicReviewProvider(api_key)
+            self.provider = AnthropicReviewProvider(api_key, client)
         elif provider == "gemini":
-            self.provider = GeminiReviewProvider(api_key)
+            self.provider = GeminiReviewProvider(api_key, client)
         else:
             raise ValueError(f"지원하지 않는 provider: {provider}")
     
     def review(
         self,
-        changes: List[FileChange],
+        changes: List["FileChange"],
         config: dict,
-        level: str = ReviewLevel.QUICK
+        level: str = ReviewLevel.QUICK,
+        on_token: Optional[Callable[[str], None]] = None,
+        stream: bool = False,
+        session: Optional[ReviewSession] = None
     ) -> Dict[str, any]:
         """
         코드 리뷰 수행
@@ -656,34 +1129,180 @@ class CodeReviewer:
             changes: 변경사항 목록
             config: 설정
             level: 리뷰 레벨 (quick/normal/detailed)
+            on_token: 스트리밍 콜백 (지정하면 응답 토큰이 도착할 때마다 호출)
+            stream: True이고 on_token이 없으면 응답 토큰을 도착하는 대로 출력
+            session: 반복 리뷰 세션 (지정하면 이전 리뷰 이후 바뀐 파일만 전송)
         
         Returns:
             리뷰 결과 및 토큰 사용량 정보
         """
+        if stream and on_token is None:
+            on_token = _print_token
+        
         if not changes:
             return {
                 'review': '✅ 변경사항이 없습니다.',
                 'token_estimate': 0
             }
         
-        # diff 압축
-        compressed_diff = DiffCompressor.compress(changes, level)
+        # quick 리뷰: 포맷 변경, lock 파일 등 중요한 라인이 없으면 API 호출 생략
+        if level == ReviewLevel.QUICK and not DiffCompressor.has_signal(changes):
+            self.stats['skipped'] += 1
+            if on_token is not None:
+                on_token(NO_SIGNAL_REVIEW)
+            return self._result(NO_SIGNAL_REVIEW, '', 0, level, cache_hit=False)
+        
+        # diff 압축 (규칙 기반 문구 압축은 정적 템플릿에만 적용 - 식별자/시그니처/이전 리뷰는 그대로)
+        compressed_diff = DiffCompressor.compress(changes, level, session)
+        
+        # 세션: 모든 파일이 이전 리뷰와 같으면 이전 리뷰 재사용
+        if session is not None and not session.has_fresh and session.last_review:
+            review_text = session.last_review
+            session.commit(review_text)
+            self.stats['cache_hits'] += 1
+            if on_token is not None:
+                on_token(review_text)
+            return self._result(review_text, compressed_diff, 0, level, cache_hit=True)
         
         # 토큰 추정 (대략적)
-        token_estimate = len(compressed_diff) // 4  # 평균 4자 = 1토큰
+        token_estimate = estimate_tokens(compressed_diff, config.get('ai', {}).get('model', ''))
+        
+        # 같은 압축 diff + provider/모델/레벨/생성 설정이면 API 호출 없이 이전 리뷰 재사용
+        cache_key = None
+        temperature = config.get('review', {}).get('temperature', 0.2)
+        if config.get('cache', {}).get('enabled', True):
+            cache_key = ResponseCache.make_key(
+                'review', self.provider_name, config.get('ai', {}).get('model', ''), level,
+                compressed_diff, str(temperature), str(self.provider._get_max_tokens(level, config, token_estimate)),
+                ResponseCache.digest_config(config.get('review', {}))
+            )
+            review_text = self.cache.get(cache_key)
+            if review_text is not None:
+                self.stats['cache_hits'] += 1
+                if on_token is not None:
+                    on_token(review_text)
+                if session is not None:
+                    session.commit(review_text)
+                return self._result(review_text, compressed_diff, token_estimate, level, cache_hit=True)
+            self.stats['cache_misses'] += 1
         
         # AI 리뷰 수행
         try:
-            review_text = self.provider.review_code(compressed_diff, level, config)
+            if on_token is None:
+                review_text = self.provider.review_code(compressed_diff, level, config)
+            else:
+                chunks = []
+                for chunk in self.provider.review_code_stream(compressed_diff, level, config):
+                    chunks.append(chunk)
+                    on_token(chunk)
+                review_text = "".join(chunks).strip()
+        except Exception as e:
+            raise RuntimeError(f"코드 리뷰 실패: {e}")
+        
+        if cache_key is not None and review_text:
+            self.cache.set(cache_key, review_text)
+        if session is not None:
+            session.commit(review_text)
+        
+        return self._result(review_text, compressed_diff, token_estimate, level, cache_hit=False)
+    
+    async def review_stream_async(
+        self,
+        changes: List["FileChange"],
+        config: dict,
+        level: str = ReviewLevel.QUICK
+    ) -> AsyncIterator[str]:
+        """
+        비동기 스트리밍 코드 리뷰 (응답 조각을 도착하는 대로 yield)
+        
+        Args:
+            changes: 변경사항 목록
+            config: 설정
+            level: 리뷰 레벨 (quick/normal/detailed)
+        """
+        if not changes:
+            yield '✅ 변경사항이 없습니다.'
+            return
+        
+        if level == ReviewLevel.QUICK and not DiffCompressor.has_signal(changes):
+            self.stats['skipped'] += 1
+            yield NO_SIGNAL_REVIEW
+            return
+        
+        compressed_diff = DiffCompressor.compress(changes, level)
+        
+        try:
+            async for chunk in self.provider.review_code_astream(compressed_diff, level, config):
+                yield chunk
+        except Exception as e:
+            raise RuntimeError(f"코드 리뷰 실패: {e}")
+        finally:
+            await self.provider.aclose()
+    
+    def _result(self, review_text: str, compressed_diff: str, token_estimate: int, level: str,
+                cache_hit: bool) -> Dict[str, any]:
+        """리뷰 결과 딕셔너리 생성 (캐시 적중/생략 통계 포함)"""
+        return {
+            'review': review_text,
+            'compressed_diff': compressed_diff,
+            'token_estimate': token_estimate,
+            'level': level,
+            'cache_hit': cache_hit,
+            'stats': dict(self.stats)
+        }
+    
+    async def review_many_async(
+        self,
+        change_sets: List[List["FileChange"]],
+        config: dict,
+        level: str = ReviewLevel.QUICK
+    ) -> List[Dict[str, any]]:
+        """
+        여러 변경사항 묶음을 동시에 리뷰 (asyncio.gather)
+        
+        Args:
+            change_sets: 변경사항 목록의 리스트 (예: 파일별로 나눈 변경사항)
+            config: 설정
+            level: 리뷰 레벨 (quick/normal/detailed)
+        
+        Returns:
+            change_sets 순서대로 review()와 같은 형식의 결과 리스트
+        """
+        async def review_one(changes: List["FileChange"]) -> Dict[str, any]:
+            if not changes:
+                return {
+                    'review': '✅ 변경사항이 없습니다.',
+                    'token_estimate': 0
+                }
+            
+            compressed_diff = DiffCompressor.compress(changes, level)
+            try:
+                review_text = await self.provider.review_code_async(compressed_diff, level, config)
+            except Exception as e:
+                raise RuntimeError(f"코드 리뷰 실패: {e}")
             
             return {
                 'review': review_text,
                 'compressed_diff': compressed_diff,
-                'token_estimate': token_estimate,
+                'token_estimate': estimate_tokens(compressed_diff, config.get('ai', {}).get('model', '')),
                 'level': level
             }
-        except Exception as e:
-            raise RuntimeError(f"코드 리뷰 실패: {e}")
+        
+        import asyncio
+        try:
+            return list(await asyncio.gather(*(review_one(changes) for changes in change_sets)))
+        finally:
+            await self.provider.aclose()
+    
+    def review_many(
+        self,
+        change_sets: List[List["FileChange"]],
+        config: dict,
+        level: str = ReviewLevel.QUICK
+    ) -> List[Dict[str, any]]:
+        """review_many_async의 동기 래퍼 (실행 중인 이벤트 루프 밖에서 호출)"""
+        import asyncio
+        return asyncio.run(self.review_many_async(change_sets, config, level))
 
 
 if __name__ == "__main__":
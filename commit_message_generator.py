@@ -4,9 +4,275 @@ OpenAI 또는 Anthropic API를 사용하여 커밋 메시지를 생성합니다.
 """
 
 import os
-from typing import List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from operator import attrgetter
+from typing import Callable, Iterator, List, Optional
 from abc import ABC, abstractmethod
 from git_analyzer import FileChange
+from response_cache import ResponseCache
+
+
+# 시스템 프롬프트 (매 호출마다 동일한 정적 접두부 → 프로바이더 프롬프트 캐시 대상)
+SYSTEM_PROMPT = "You are an expert at writing clear, concise Git commit messages following best practices and Conventional Commits format."
+
+
+# diff에서 살펴볼 최대 줄 수 / 최대 문자 수 (파일당 앞부분만, 긴 한 줄짜리 diff 대비)
+DIFF_SCAN_LINES = 200
+DIFF_SCAN_CHARS = 32 * 1024
+
+# 이보다 큰 diff는 전체를 훑어 시그니처 + 예산 내 변경 줄로 압축 (최대 LARGE_DIFF_SCAN_CHARS자까지)
+LARGE_DIFF_CHARS = 8 * 1024
+LARGE_DIFF_BUDGET = 1536
+LARGE_DIFF_SCAN_CHARS = 1024 * 1024
+
+# 이보다 작은 새 파일 하나만 추가된 경우 AI 호출 없이 템플릿 메시지 사용
+TRIVIAL_NEW_FILE_LINES = 50
+
+# 들여쓰기가 의미를 갖는 파일 (들여쓰기만 바뀌어도 동작이 달라지므로 style로 취급하지 않음)
+_INDENT_SENSITIVE_EXTS = frozenset((
+    '.py', '.pyi', '.pyw', '.yaml', '.yml', '.coffee', '.haml', '.pug', '.jade', '.sass', '.styl', '.slim', '.nim'
+))
+_INDENT_SENSITIVE_NAMES = frozenset(('Makefile', 'makefile', 'GNUmakefile'))
+
+# 변경 타입별 표시
+_CHANGE_SYMBOL = {
+    'A': '🆕 ADDED (NEW FILE)',
+    'M': '📝 MODIFIED',
+    'D': '🗑️  DELETED',
+    'R': '📋 RENAMED'
+}
+
+# diff 라인 분류용 정규식 (파일마다 줄 단위 Python 루프 대신 정규식 엔진에서 한 번에 처리)
+_HEAD_RE = re.compile(r'(?:[^\n]*\n){0,%d}[^\n]*' % (DIFF_SCAN_LINES - 1))
+_ADD_RE = re.compile(r'^\+(?!\+\+)(.*)$', re.M)
+_DEL_RE = re.compile(r'^-(?!--)(.*)$', re.M)
+# 새 메서드/함수 후보 (키워드 포함 + 괄호)
+_METHOD_RE = re.compile(r'public |private |protected |def |function |async |@')
+# 엔드포인트/매핑 어노테이션 (@로 시작)
+_ENDPOINT_RE = re.compile(r'Mapping|Path|Route')
+
+
+# 커밋 메시지 프롬프트의 정적 부분 (매 호출마다 동일 → 한 번만 생성, 프롬프트 캐시 접두부)
+PROMPT_HEADER = """You are a Git commit message expert. Write ONE SPECIFIC commit message.
+
+🚨 CRITICAL RULES:
+1. Be SPECIFIC - say WHAT was added/fixed, not generic terms
+2. AVOID: implement, functionality, feature, improve, update, change, endpoint, resource, service, logic
+3. USE: add [specific thing], fix [specific bug], refactor [specific part]
+4. Max 60 characters, lowercase after colon
+
+📌 TYPE RULES:
+- feat: NEW functionality (new methods/APIs/endpoints)
+- fix: BUG fix (fixing broken behavior)
+- refactor: Code restructure (NO new features)
+
+✅ GOOD (SPECIFIC):
+- feat: add config comparison validation
+- feat: add JWT token refresh endpoint
+- feat: add rollback handling for transfers
+- fix: null pointer in user lookup
+- fix: validation error in email format
+
+❌ BAD (TOO GENERIC - FORBIDDEN!):
+- feat: implement transfer functionality ❌
+- feat: add new feature ❌
+- feat: improve service ❌
+- fix: update code ❌
+- refactor: restructure code ❌
+
+💡 HOW TO BE SPECIFIC:
+Look at method names, endpoints, class names in the diff!
+- See 'compareConfigs()' → say 'add config comparison'
+- See 'validateTransfer()' → say 'add transfer validation'
+- See '@POST /rollback' → say 'add rollback endpoint'
+
+"""
+
+CHANGES_HEADER = """Git Changes:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+"""
+
+PROMPT_FOOTER = """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+🎯 YOUR TASK: Read the ACTUAL method names above and write a commit message.
+
+📖 STEP 1: Look at 'DETECTED NEW METHODS/FUNCTIONS' section.
+   Extract ACTION from each method name:
+   - Method name format: `actionSubject` (e.g., `getUserData`, `validateEmail`, `exportReport`)
+   - Extract: action + what (e.g., 'get user data', 'validate email', 'export report')
+
+🚨 CRITICAL: Use ONLY what you see in the actual method names. Do NOT invent!
+
+📝 STEP 2: Decide commit type.
+   - NEW public methods/APIs → `feat:`
+   - Code restructure only → `refactor:`
+
+✍️ STEP 3: Write message (max 60 chars).
+   Format: `feat: add [action1], [action2]`
+   Example pattern: `feat: add user retrieval, email validation`
+
+❌ FORBIDDEN: endpoint, resource, service, logic, functionality, operations
+✅ ALLOWED: list, get, compare, transfer, export, validate, import, delete
+
+Write commit message based on ACTUAL method names:"""
+
+
+def build_system_prompt(config: dict) -> str:
+    """설정 기반 시스템 프롬프트 생성 (실행마다 변하지 않는 commit 설정만 사용)"""
+    commit_config = config.get('commit') or {}
+    
+    system_prompt = SYSTEM_PROMPT
+    if commit_config.get('conventional_commits', True) and commit_config.get('types'):
+        system_prompt += f"\nAllowed commit types: {', '.join(commit_config['types'])}"
+    
+    return system_prompt
+
+
+def build_prompt(changes: List[FileChange], config: dict) -> str:
+    """커밋 메시지 프롬프트 생성 (모든 프로바이더 공용)"""
+    return "".join(build_prompt_parts(changes, config))
+
+
+def _compress_diff(diff: str, budget_chars: int) -> str:
+    """
+    큰 diff 압축: 새 메서드/엔드포인트 시그니처를 먼저 넣고,
+    남은 예산만큼 추가/삭제 줄을 번갈아 넣은 뒤 나머지는 생략 표시
+    """
+    added_lines = [line.strip() for line in _ADD_RE.findall(diff, 0, LARGE_DIFF_SCAN_CHARS)]
+    removed_lines = [line.strip() for line in _DEL_RE.findall(diff, 0, LARGE_DIFF_SCAN_CHARS)]
+    new_methods = [line for line in added_lines if '(' in line and _METHOD_RE.search(line)][:10]
+    endpoints = [line for line in added_lines if line.startswith('@') and _ENDPOINT_RE.search(line)][:8]
+    
+    parts = []
+    if new_methods:
+        parts.append(f"\n⚠️  DETECTED {len(new_methods)} NEW METHODS/FUNCTIONS - This is likely a FEAT, not refactor!\n")
+        parts.append("New methods:\n")
+        parts.extend(f"  + {method[:120]}\n" for method in new_methods)
+    if endpoints:
+        parts.append("Detected endpoints/annotations:\n")
+        parts.extend(f"  + {ep[:120]}\n" for ep in endpoints)
+    
+    shown = set(new_methods) | set(endpoints)
+    added = [f"    + {line[:120]}\n" for line in added_lines if len(line) > 3 and line not in shown]
+    removed = [f"    - {line[:100]}\n" for line in removed_lines if len(line) > 3]
+    
+    parts.append(f"\nKey changes (compressed, {len(added_lines)} added / {len(removed_lines)} removed lines):\n")
+    used = kept = 0
+    for line in chain.from_iterable(zip_longest(added, removed)):
+        if line is None:
+            continue
+        if used + len(line) > budget_chars:
+            break
+        parts.append(line)
+        used += len(line)
+        kept += 1
+    
+    omitted = len(added) + len(removed) - kept
+    if omitted:
+        parts.append(f"    ... ({omitted} lines omitted) ...\n")
+    return "".join(parts)
+
+
+def _normalize_lines(lines: List[str], keep_indent: bool = False) -> List[str]:
+    """앞뒤 공백(keep_indent면 끝 공백만)을 제거하고 빈 줄을 뺀 목록 (공백만 바뀐 diff 비교용, 줄 순서 유지)
+    
+    줄 중간의 공백은 그대로 비교합니다. ('a b' → 'ab'는 토큰이 바뀌는 변경)
+    """
+    strip = str.rstrip if keep_indent else str.strip
+    return [text for text in map(strip, lines) if text]
+
+
+def _is_indent_sensitive(path: str) -> bool:
+    """들여쓰기가 문법/동작에 영향을 주는 파일인지 (Python, YAML, Makefile 등)"""
+    name = os.path.basename(path)
+    return name in _INDENT_SENSITIVE_NAMES or os.path.splitext(name)[1].lower() in _INDENT_SENSITIVE_EXTS
+
+
+def _try_trivial_message(changes: List[FileChange]) -> Optional[str]:
+    """
+    AI 없이 결정할 수 있는 단순 변경이면 템플릿 커밋 메시지 반환 (아니면 None)
+    
+    - 모든 변경이 줄 앞뒤 공백만 바뀜 → style (Python/YAML 등은 끝 공백만)
+    - 짧은 새 파일 하나만 추가 → feat
+    """
+    if len(changes) == 1:
+        change = changes[0]
+        if (change.change_type == 'A' and not change.deletions
+                and 0 < change.insertions < TRIVIAL_NEW_FILE_LINES):
+            return f"feat: add {change.path}"
+    
+    if all(change.change_type == 'M' and change.diff for change in changes):
+        changed = False
+        for change in changes:
+            added = _ADD_RE.findall(change.diff)
+            removed = _DEL_RE.findall(change.diff)
+            keep_indent = _is_indent_sensitive(change.path)
+            if _normalize_lines(added, keep_indent) != _normalize_lines(removed, keep_indent):
+                return None
+            changed = changed or bool(added or removed)
+        if changed:
+            return "style: whitespace cleanup"
+    
+    return None
+
+
+def build_prompt_parts(changes: List[FileChange], config: dict) -> tuple:
+    """(정적 접두부 PROMPT_HEADER, 변경사항 + 접미부) 분리 생성 - 접두부를 캐시 블록으로 보낼 때 사용"""
+    parts = [CHANGES_HEADER]
+    
+    for change in changes:
+        change_symbol = _CHANGE_SYMBOL.get(change.change_type, 'CHANGED')
+        
+        parts.append(f"\nFile: {change.path} ({change_symbol})\n")
+        parts.append(f"Stats: +{change.insertions} / -{change.deletions} lines\n")
+        
+        # 큰 diff는 전체를 압축 요약
+        if change.diff and len(change.diff) > LARGE_DIFF_CHARS:
+            parts.append(_compress_diff(change.diff, LARGE_DIFF_BUDGET))
+        # Diff 내용을 더 상세히 포함
+        elif change.diff:
+            # 처음 DIFF_SCAN_LINES줄, DIFF_SCAN_CHARS자까지만 분류 (diff 전체를 복사/분할하지 않음)
+            head = _HEAD_RE.match(change.diff, 0, DIFF_SCAN_CHARS).group()
+            added_lines = [line.strip() for line in _ADD_RE.findall(head)]
+            removed_lines = [line.strip() for line in _DEL_RE.findall(head)]
+            # 새로운 메서드/함수 감지
+            new_methods = [line for line in added_lines if '(' in line and _METHOD_RE.search(line)]
+            # 엔드포인트/매핑 어노테이션 감지
+            endpoints = [line for line in added_lines if line.startswith('@') and _ENDPOINT_RE.search(line)]
+            
+            # 🚨 새 메서드가 많으면 반드시 강조
+            if new_methods:
+                parts.append(f"\n⚠️  DETECTED {len(new_methods)} NEW METHODS/FUNCTIONS - This is likely a FEAT, not refactor!\n")
+                parts.append("New methods:\n")
+                for method in new_methods[:10]:
+                    parts.append(f"  + {method[:120]}\n")
+            # 📌 감지된 엔드포인트/어노테이션 노출
+            if endpoints:
+                parts.append("Detected endpoints/annotations:\n")
+                for ep in endpoints[:8]:
+                    parts.append(f"  + {ep[:120]}\n")
+            
+            if added_lines or removed_lines:
+                parts.append("\nKey changes:\n")
+                
+                if added_lines:
+                    parts.append(f"  ADDED ({len(added_lines)} lines):\n")
+                    for line in added_lines[:20]:  # 추가된 줄 20개로 확대
+                        if line and len(line) > 3:  # 빈 줄 제외
+                            parts.append(f"    + {line[:120]}\n")
+                
+                if removed_lines:
+                    parts.append(f"  REMOVED ({len(removed_lines)} lines):\n")
+                    for line in removed_lines[:10]:  # 삭제된 줄 10개
+                        if line and len(line) > 3:  # 빈 줄 제외
+                            parts.append(f"    - {line[:100]}\n")
+    
+    parts.append(PROMPT_FOOTER)
+    
+    return PROMPT_HEADER, "".join(parts)
 
 
 class AIProvider(ABC):
@@ -16,25 +282,58 @@ class AIProvider(ABC):
     def generate_commit_message(self, changes: List[FileChange], config: dict) -> str:
         """커밋 메시지 생성"""
         pass
+    
+    def generate_commit_message_stream(self, changes: List[FileChange], config: dict) -> Iterator[str]:
+        """커밋 메시지 스트리밍 생성 (기본: 전체 응답을 한 번에 반환)"""
+        yield self.generate_commit_message(changes, config)
+    
+    async def generate_commit_message_async(self, changes: List[FileChange], config: dict) -> str:
+        """비동기 커밋 메시지 생성 (기본: 동기 호출을 스레드에서 실행)"""
+        import asyncio
+        # asyncio.to_thread는 3.9+ → 기본 스레드 풀 executor 직접 사용
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate_commit_message, changes, config)
+    
+    async def aclose(self) -> None:
+        """비동기 클라이언트 정리 (이벤트 루프가 끝나기 전에 호출)"""
+        pass
+    
+    def generate_commit_messages(self, changes: List[FileChange], config: dict, n: int) -> List[str]:
+        """커밋 메시지 후보 n개 생성 (기본: 단일 생성 요청을 동시에 n번 수행)"""
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            futures = [executor.submit(self.generate_commit_message, changes, config) for _ in range(n)]
+            return [future.result() for future in futures]
+    
+    def _build_prompt(self, changes: List[FileChange], config: dict) -> str:
+        """프롬프트 생성"""
+        return build_prompt(changes, config)
+    
+    def _build_prompt_parts(self, changes: List[FileChange], config: dict) -> tuple:
+        """(정적 접두부, 변경사항 + 접미부) 프롬프트 생성"""
+        return build_prompt_parts(changes, config)
 
 
 class OpenAIProvider(AIProvider):
     """OpenAI API 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, system_prompt: str = SYSTEM_PROMPT, client=None):
+        self.system_prompt = system_prompt
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
+            self.client = client or OpenAI(api_key=api_key)
         except ImportError:
             raise ImportError("OpenAI 라이브러리가 설치되지 않았습니다. 'pip install openai'를 실행하세요.")
+        self.api_key = api_key
+        self.async_client = None
     
     def generate_commit_message(self, changes: List[FileChange], config: dict) -> str:
         """OpenAI를 사용하여 커밋 메시지 생성"""
         prompt = self._build_prompt(changes, config)
         
-        model = config.get('ai', {}).get('model', 'gpt-4')
-        temperature = config.get('ai', {}).get('temperature', 0.3)
-        max_tokens = config.get('ai', {}).get('max_tokens', 500)
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'gpt-4')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
         
         try:
             response = self.client.chat.completions.create(
@@ -42,7 +341,7 @@ class OpenAIProvider(AIProvider):
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert at writing clear, concise Git commit messages following best practices and Conventional Commits format."
+                        "content": self.system_prompt
                     },
                     {
                         "role": "user",
@@ -57,150 +356,146 @@ class OpenAIProvider(AIProvider):
         except Exception as e:
             raise RuntimeError(f"OpenAI API 호출 실패: {e}")
     
-    def _build_prompt(self, changes: List[FileChange], config: dict) -> str:
-        """프롬프트 생성"""
-        use_conventional = config.get('commit', {}).get('conventional_commits', True)
-        max_subject_length = config.get('commit', {}).get('max_subject_length', 72)
-        
-        prompt = "You are a Git commit message expert. Write ONE SPECIFIC commit message.\n\n"
-        
-        prompt += "🚨 CRITICAL RULES:\n"
-        prompt += "1. Be SPECIFIC - say WHAT was added/fixed, not generic terms\n"
-        prompt += "2. AVOID: implement, functionality, feature, improve, update, change, endpoint, resource, service, logic\n"
-        prompt += "3. USE: add [specific thing], fix [specific bug], refactor [specific part]\n"
-        prompt += "4. Max 60 characters, lowercase after colon\n\n"
-        
-        prompt += "📌 TYPE RULES:\n"
-        prompt += "- feat: NEW functionality (new methods/APIs/endpoints)\n"
-        prompt += "- fix: BUG fix (fixing broken behavior)\n"
-        prompt += "- refactor: Code restructure (NO new features)\n\n"
-        
-        prompt += "✅ GOOD (SPECIFIC):\n"
-        prompt += "- feat: add config comparison validation\n"
-        prompt += "- feat: add JWT token refresh endpoint\n"
-        prompt += "- feat: add rollback handling for transfers\n"
-        prompt += "- fix: null pointer in user lookup\n"
-        prompt += "- fix: validation error in email format\n\n"
-        
-        prompt += "❌ BAD (TOO GENERIC - FORBIDDEN!):\n"
-        prompt += "- feat: implement transfer functionality ❌\n"
-        prompt += "- feat: add new feature ❌\n"
-        prompt += "- feat: improve service ❌\n"
-        prompt += "- fix: update code ❌\n"
-        prompt += "- refactor: restructure code ❌\n\n"
-        
-        prompt += "💡 HOW TO BE SPECIFIC:\n"
-        prompt += "Look at method names, endpoints, class names in the diff!\n"
-        prompt += "- See 'compareConfigs()' → say 'add config comparison'\n"
-        prompt += "- See 'validateTransfer()' → say 'add transfer validation'\n"
-        prompt += "- See '@POST /rollback' → say 'add rollback endpoint'\n\n"
-        
-        prompt += "Git Changes:\n"
-        prompt += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    def generate_commit_message_stream(self, changes: List[FileChange], config: dict) -> Iterator[str]:
+        """OpenAI 스트리밍 응답으로 커밋 메시지 생성"""
+        prompt = self._build_prompt(changes, config)
         
-        for change in changes:
-            change_symbol = {
-                'A': '🆕 ADDED (NEW FILE)',
-                'M': '📝 MODIFIED',
-                'D': '🗑️  DELETED',
-                'R': '📋 RENAMED'
-            }.get(change.change_type, 'CHANGED')
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'gpt-4')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self.system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
+    
+    def generate_commit_messages(self, changes: List[FileChange], config: dict, n: int) -> List[str]:
+        """OpenAI n 파라미터로 한 번의 요청에서 후보 n개 생성 (입력 토큰은 한 번만 과금)"""
+        prompt = self._build_prompt(changes, config)
+        
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'gpt-4')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self.system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                n=n
+            )
             
-            prompt += f"\nFile: {change.path} ({change_symbol})\n"
-            prompt += f"Stats: +{change.insertions} / -{change.deletions} lines\n"
+            return [choice.message.content.strip() for choice in response.choices]
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
+    
+    async def generate_commit_message_async(self, changes: List[FileChange], config: dict) -> str:
+        """AsyncOpenAI를 사용하여 커밋 메시지 생성"""
+        prompt = self._build_prompt(changes, config)
+        
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'gpt-4')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
+        
+        try:
+            if self.async_client is None:
+                from openai import AsyncOpenAI
+                self.async_client = AsyncOpenAI(api_key=self.api_key)
             
-            # Diff 내용을 더 상세히 포함
-            if change.diff:
-                diff_lines = change.diff.split('\n')
-                
-                # 모든 변경사항 포함 (제한을 크게 늘림)
-                added_lines = []
-                removed_lines = []
-                new_methods = []
-                endpoints = []
-                
-                for line in diff_lines[:200]:  # 처음 200줄까지 확장
-                    if line.startswith('+') and not line.startswith('+++'):
-                        added_line = line[1:].strip()
-                        added_lines.append(added_line)
-                        # 새로운 메서드/함수 감지
-                        if any(keyword in added_line for keyword in ['public ', 'private ', 'protected ', 'def ', 'function ', 'async ', '@']):
-                            if '(' in added_line:
-                                new_methods.append(added_line)
-                        # 엔드포인트/매핑 어노테이션 감지
-                        if added_line.startswith('@') and any(marker in added_line for marker in ['Mapping', 'RequestMapping', 'Path', 'Route']):
-                            endpoints.append(added_line)
-                    elif line.startswith('-') and not line.startswith('---'):
-                        removed_lines.append(line[1:].strip())
-                
-                # 🚨 새 메서드가 많으면 반드시 강조
-                if new_methods:
-                    prompt += f"\n⚠️  DETECTED {len(new_methods)} NEW METHODS/FUNCTIONS - This is likely a FEAT, not refactor!\n"
-                    prompt += "New methods:\n"
-                    for method in new_methods[:10]:
-                        prompt += f"  + {method[:120]}\n"
-                # 📌 감지된 엔드포인트/어노테이션 노출
-                if endpoints:
-                    prompt += "Detected endpoints/annotations:\n"
-                    for ep in endpoints[:8]:
-                        prompt += f"  + {ep[:120]}\n"
-                
-                if added_lines or removed_lines:
-                    prompt += "\nKey changes:\n"
-                    
-                    if added_lines:
-                        prompt += f"  ADDED ({len(added_lines)} lines):\n"
-                        for line in added_lines[:20]:  # 추가된 줄 20개로 확대
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    + {line[:120]}\n"
-                    
-                    if removed_lines:
-                        prompt += f"  REMOVED ({len(removed_lines)} lines):\n"
-                        for line in removed_lines[:10]:  # 삭제된 줄 10개
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    - {line[:100]}\n"
-        
-        prompt += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        prompt += "\n🎯 YOUR TASK: Read the ACTUAL method names above and write a commit message.\n\n"
-        prompt += "📖 STEP 1: Look at 'DETECTED NEW METHODS/FUNCTIONS' section.\n"
-        prompt += "   Extract ACTION from each method name:\n"
-        prompt += "   - Method name format: `actionSubject` (e.g., `getUserData`, `validateEmail`, `exportReport`)\n"
-        prompt += "   - Extract: action + what (e.g., 'get user data', 'validate email', 'export report')\n\n"
-        prompt += "🚨 CRITICAL: Use ONLY what you see in the actual method names. Do NOT invent!\n\n"
-        prompt += "📝 STEP 2: Decide commit type.\n"
-        prompt += "   - NEW public methods/APIs → `feat:`\n"
-        prompt += "   - Code restructure only → `refactor:`\n\n"
-        prompt += "✍️ STEP 3: Write message (max 60 chars).\n"
-        prompt += "   Format: `feat: add [action1], [action2]`\n"
-        prompt += "   Example pattern: `feat: add user retrieval, email validation`\n\n"
-        prompt += "❌ FORBIDDEN: endpoint, resource, service, logic, functionality, operations\n"
-        prompt += "✅ ALLOWED: list, get, compare, transfer, export, validate, import, delete\n\n"
-        prompt += "Write commit message based on ACTUAL method names:"
-        
-        return prompt
+            response = await self.async_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self.system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API 호출 실패: {e}")
+    
+    async def aclose(self) -> None:
+        """AsyncOpenAI 클라이언트 정리"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
 
 
 class GeminiProvider(AIProvider):
     """Google Gemini API 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, system_prompt: str = SYSTEM_PROMPT, client=None):
+        self.system_prompt = system_prompt
+        # 정적 접두부를 시스템 지시문에 합쳐 매 호출 동일한 접두부로 전송 (암시적 컨텍스트 캐시 대상)
+        self.system_instruction = f"{system_prompt}\n\n{PROMPT_HEADER}"
         try:
             import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            self.genai = genai
+            if client is None:
+                genai.configure(api_key=api_key)
+            self.genai = client or genai
         except ImportError:
             raise ImportError("Google Generative AI 라이브러리가 설치되지 않았습니다. 'pip install google-generativeai'를 실행하세요.")
+        self._models = {}
+    
+    def _get_model(self, model_name: str):
+        """모델 객체 재사용 (시스템 지시문이 고정이므로 모델 이름별로 한 번만 생성)"""
+        model = self._models.get(model_name)
+        if model is None:
+            model = self.genai.GenerativeModel(model_name, system_instruction=self.system_instruction)
+            self._models[model_name] = model
+        return model
     
     def generate_commit_message(self, changes: List[FileChange], config: dict) -> str:
         """Google Gemini를 사용하여 커밋 메시지 생성"""
-        prompt = self._build_prompt(changes, config)
+        _, prompt = self._build_prompt_parts(changes, config)
         
-        model_name = config.get('ai', {}).get('model', 'gemini-2.0-flash')
-        temperature = config.get('ai', {}).get('temperature', 0.2)
-        max_tokens = config.get('ai', {}).get('max_tokens', 100)
+        ai_config = config.get('ai') or {}
+        model_name = ai_config.get('model', 'gemini-2.0-flash')
+        temperature = ai_config.get('temperature', 0.2)
+        max_tokens = ai_config.get('max_tokens', 100)
         
         try:
-            model = self.genai.GenerativeModel(model_name)
+            model = self._get_model(model_name)
             
             generation_config = {
                 "temperature": temperature,
@@ -216,150 +511,131 @@ class GeminiProvider(AIProvider):
         except Exception as e:
             raise RuntimeError(f"Gemini API 호출 실패: {e}")
     
-    def _build_prompt(self, changes: List[FileChange], config: dict) -> str:
-        """프롬프트 생성"""
-        prompt = "You are a Git commit message expert. Write ONE SPECIFIC commit message.\n\n"
-        
-        prompt += "🚨 CRITICAL RULES:\n"
-        prompt += "1. Be SPECIFIC - say WHAT was added/fixed, not generic terms\n"
-        prompt += "2. AVOID: implement, functionality, feature, improve, update, change, endpoint, resource, service, logic\n"
-        prompt += "3. USE: add [specific thing], fix [specific bug], refactor [specific part]\n"
-        prompt += "4. Max 60 characters, lowercase after colon\n\n"
-        
-        prompt += "📌 TYPE RULES:\n"
-        prompt += "- feat: NEW functionality (new methods/APIs/endpoints)\n"
-        prompt += "- fix: BUG fix (fixing broken behavior)\n"
-        prompt += "- refactor: Code restructure (NO new features)\n\n"
-        
-        prompt += "✅ GOOD (SPECIFIC):\n"
-        prompt += "- feat: add config comparison validation\n"
-        prompt += "- feat: add JWT token refresh endpoint\n"
-        prompt += "- feat: add rollback handling for transfers\n"
-        prompt += "- fix: null pointer in user lookup\n"
-        prompt += "- fix: validation error in email format\n\n"
-        
-        prompt += "❌ BAD (TOO GENERIC - FORBIDDEN!):\n"
-        prompt += "- feat: implement transfer functionality ❌\n"
-        prompt += "- feat: add new feature ❌\n"
-        prompt += "- feat: improve service ❌\n"
-        prompt += "- fix: update code ❌\n"
-        prompt += "- refactor: restructure code ❌\n\n"
-        
-        prompt += "💡 HOW TO BE SPECIFIC:\n"
-        prompt += "Look at method names, endpoints, class names in the diff!\n"
-        prompt += "- See 'compareConfigs()' → say 'add config comparison'\n"
-        prompt += "- See 'validateTransfer()' → say 'add transfer validation'\n"
-        prompt += "- See '@POST /rollback' → say 'add rollback endpoint'\n\n"
-        
-        prompt += "Git Changes:\n"
-        prompt += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    def generate_commit_message_stream(self, changes: List[FileChange], config: dict) -> Iterator[str]:
+        """Gemini 스트리밍 응답으로 커밋 메시지 생성"""
+        _, prompt = self._build_prompt_parts(changes, config)
         
-        for change in changes:
-            change_symbol = {
-                'A': '🆕 ADDED (NEW FILE)',
-                'M': '📝 MODIFIED',
-                'D': '🗑️  DELETED',
-                'R': '📋 RENAMED'
-            }.get(change.change_type, 'CHANGED')
+        ai_config = config.get('ai') or {}
+        model_name = ai_config.get('model', 'gemini-2.0-flash')
+        temperature = ai_config.get('temperature', 0.2)
+        max_tokens = ai_config.get('max_tokens', 100)
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
             
-            prompt += f"\nFile: {change.path} ({change_symbol})\n"
-            prompt += f"Stats: +{change.insertions} / -{change.deletions} lines\n"
+            response = model.generate_content(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
             
-            # Diff 내용을 더 상세히 포함
-            if change.diff:
-                diff_lines = change.diff.split('\n')
-                
-                # 모든 변경사항 포함 (제한을 크게 늘림)
-                added_lines = []
-                removed_lines = []
-                new_methods = []
-                endpoints = []
-                
-                for line in diff_lines[:200]:  # 처음 200줄까지 확장
-                    if line.startswith('+') and not line.startswith('+++'):
-                        added_line = line[1:].strip()
-                        added_lines.append(added_line)
-                        # 새로운 메서드/함수 감지
-                        if any(keyword in added_line for keyword in ['public ', 'private ', 'protected ', 'def ', 'function ', 'async ', '@']):
-                            if '(' in added_line:
-                                new_methods.append(added_line)
-                        # 엔드포인트/매핑 어노테이션 감지
-                        if added_line.startswith('@') and any(marker in added_line for marker in ['Mapping', 'RequestMapping', 'Path', 'Route']):
-                            endpoints.append(added_line)
-                    elif line.startswith('-') and not line.startswith('---'):
-                        removed_lines.append(line[1:].strip())
-                
-                # 🚨 새 메서드가 많으면 반드시 강조
-                if new_methods:
-                    prompt += f"\n⚠️  DETECTED {len(new_methods)} NEW METHODS/FUNCTIONS - This is likely a FEAT, not refactor!\n"
-                    prompt += "New methods:\n"
-                    for method in new_methods[:10]:
-                        prompt += f"  + {method[:120]}\n"
-                # 📌 감지된 엔드포인트/어노테이션 노출
-                if endpoints:
-                    prompt += "Detected endpoints/annotations:\n"
-                    for ep in endpoints[:8]:
-                        prompt += f"  + {ep[:120]}\n"
-                
-                if added_lines or removed_lines:
-                    prompt += "\nKey changes:\n"
-                    
-                    if added_lines:
-                        prompt += f"  ADDED ({len(added_lines)} lines):\n"
-                        for line in added_lines[:20]:  # 추가된 줄 20개로 확대
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    + {line[:120]}\n"
-                    
-                    if removed_lines:
-                        prompt += f"  REMOVED ({len(removed_lines)} lines):\n"
-                        for line in removed_lines[:10]:  # 삭제된 줄 10개
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    - {line[:100]}\n"
-        
-        prompt += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        prompt += "\n🎯 YOUR TASK: Read the ACTUAL method names above and write a commit message.\n\n"
-        prompt += "📖 STEP 1: Look at 'DETECTED NEW METHODS/FUNCTIONS' section.\n"
-        prompt += "   Extract ACTION from each method name:\n"
-        prompt += "   - Method name format: `actionSubject` (e.g., `getUserData`, `validateEmail`, `exportReport`)\n"
-        prompt += "   - Extract: action + what (e.g., 'get user data', 'validate email', 'export report')\n\n"
-        prompt += "🚨 CRITICAL: Use ONLY what you see in the actual method names. Do NOT invent!\n\n"
-        prompt += "📝 STEP 2: Decide commit type.\n"
-        prompt += "   - NEW public methods/APIs → `feat:`\n"
-        prompt += "   - Code restructure only → `refactor:`\n\n"
-        prompt += "✍️ STEP 3: Write message (max 60 chars).\n"
-        prompt += "   Format: `feat: add [action1], [action2]`\n"
-        prompt += "   Example pattern: `feat: add user retrieval, email validation`\n\n"
-        prompt += "❌ FORBIDDEN: endpoint, resource, service, logic, functionality, operations\n"
-        prompt += "✅ ALLOWED: list, get, compare, transfer, export, validate, import, delete\n\n"
-        prompt += "Write commit message based on ACTUAL method names:"
-        
-        return prompt
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
+    
+    def generate_commit_messages(self, changes: List[FileChange], config: dict, n: int) -> List[str]:
+        """Gemini candidate_count로 한 번의 요청에서 후보 n개 생성"""
+        _, prompt = self._build_prompt_parts(changes, config)
+        
+        ai_config = config.get('ai') or {}
+        model_name = ai_config.get('model', 'gemini-2.0-flash')
+        temperature = ai_config.get('temperature', 0.2)
+        max_tokens = ai_config.get('max_tokens', 100)
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+                "candidate_count": n,
+            }
+            
+            response = model.generate_content(
+                prompt,
+                generation_config=generation_config
+            )
+            
+            return [
+                "".join(part.text for part in candidate.content.parts).strip()
+                for candidate in response.candidates
+            ]
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
+    
+    async def generate_commit_message_async(self, changes: List[FileChange], config: dict) -> str:
+        """Gemini 비동기 API로 커밋 메시지 생성"""
+        _, prompt = self._build_prompt_parts(changes, config)
+        
+        ai_config = config.get('ai') or {}
+        model_name = ai_config.get('model', 'gemini-2.0-flash')
+        temperature = ai_config.get('temperature', 0.2)
+        max_tokens = ai_config.get('max_tokens', 100)
+        
+        try:
+            model = self._get_model(model_name)
+            
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": max_tokens,
+            }
+            
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config
+            )
+            
+            return response.text.strip()
+        except Exception as e:
+            raise RuntimeError(f"Gemini API 호출 실패: {e}")
 
 
 class AnthropicProvider(AIProvider):
     """Anthropic (Claude) API 제공자"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, system_prompt: str = SYSTEM_PROMPT, client=None):
+        self.system_prompt = system_prompt
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = client or anthropic.Anthropic(api_key=api_key)
         except ImportError:
             raise ImportError("Anthropic 라이브러리가 설치되지 않았습니다. 'pip install anthropic'을 실행하세요.")
+        self.api_key = api_key
+        self.async_client = None
     
     def generate_commit_message(self, changes: List[FileChange], config: dict) -> str:
         """Anthropic Claude를 사용하여 커밋 메시지 생성"""
-        prompt = self._build_prompt(changes, config)
+        header, prompt = self._build_prompt_parts(changes, config)
         
-        model = config.get('ai', {}).get('model', 'claude-3-sonnet-20240229')
-        temperature = config.get('ai', {}).get('temperature', 0.3)
-        max_tokens = config.get('ai', {}).get('max_tokens', 500)
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'claude-3-sonnet-20240229')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
         
         try:
             response = self.client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system="You are an expert at writing clear, concise Git commit messages following best practices and Conventional Commits format.",
+                # 시스템 프롬프트 + 정적 접두부(규칙/예시)까지를 캐시 가능 블록으로 전송 (ephemeral prompt cache)
+                system=[
+                    {
+                        "type": "text",
+                        "text": self.system_prompt
+                    },
+                    {
+                        "type": "text",
+                        "text": header,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
                 messages=[
                     {
                         "role": "user",
@@ -372,135 +648,108 @@ class AnthropicProvider(AIProvider):
         except Exception as e:
             raise RuntimeError(f"Anthropic API 호출 실패: {e}")
     
-    def _build_prompt(self, changes: List[FileChange], config: dict) -> str:
-        """프롬프트 생성 (OpenAI/Anthropic과 동일)"""
-        prompt = "You are a Git commit message expert. Write ONE SPECIFIC commit message.\n\n"
-        
-        prompt += "🚨 CRITICAL RULES:\n"
-        prompt += "1. Be SPECIFIC - say WHAT was added/fixed, not generic terms\n"
-        prompt += "2. AVOID: implement, functionality, feature, improve, update, change, endpoint, resource, service, logic\n"
-        prompt += "3. USE: add [specific thing], fix [specific bug], refactor [specific part]\n"
-        prompt += "4. Max 60 characters, lowercase after colon\n\n"
-        
-        prompt += "📌 TYPE RULES:\n"
-        prompt += "- feat: NEW functionality (new methods/APIs/endpoints)\n"
-        prompt += "- fix: BUG fix (fixing broken behavior)\n"
-        prompt += "- refactor: Code restructure (NO new features)\n\n"
-        
-        prompt += "✅ GOOD (SPECIFIC):\n"
-        prompt += "- feat: add config comparison validation\n"
-        prompt += "- feat: add JWT token refresh endpoint\n"
-        prompt += "- feat: add rollback handling for transfers\n"
-        prompt += "- fix: null pointer in user lookup\n"
-        prompt += "- fix: validation error in email format\n\n"
-        
-        prompt += "❌ BAD (TOO GENERIC - FORBIDDEN!):\n"
-        prompt += "- feat: implement transfer functionality ❌\n"
-        prompt += "- feat: add new feature ❌\n"
-        prompt += "- feat: improve service ❌\n"
-        prompt += "- fix: update code ❌\n"
-        prompt += "- refactor: restructure code ❌\n\n"
-        
-        prompt += "💡 HOW TO BE SPECIFIC:\n"
-        prompt += "Look at method names, endpoints, class names in the diff!\n"
-        prompt += "- See 'compareConfigs()' → say 'add config comparison'\n"
-        prompt += "- See 'validateTransfer()' → say 'add transfer validation'\n"
-        prompt += "- See '@POST /rollback' → say 'add rollback endpoint'\n\n"
-        
-        prompt += "Git Changes:\n"
-        prompt += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    def generate_commit_message_stream(self, changes: List[FileChange], config: dict) -> Iterator[str]:
+        """Anthropic 스트리밍 응답으로 커밋 메시지 생성"""
+        header, prompt = self._build_prompt_parts(changes, config)
         
-        for change in changes:
-            change_symbol = {
-                'A': '🆕 ADDED (NEW FILE)',
-                'M': '📝 MODIFIED',
-                'D': '🗑️  DELETED',
-                'R': '📋 RENAMED'
-            }.get(change.change_type, 'CHANGED')
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'claude-3-sonnet-20240229')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
+        
+        try:
+            with self.client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=[
+                    {
+                        "type": "text",
+                        "text": self.system_prompt
+                    },
+                    {
+                        "type": "text",
+                        "text": header,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API 호출 실패: {e}")
+    
+    async def generate_commit_message_async(self, changes: List[FileChange], config: dict) -> str:
+        """AsyncAnthropic을 사용하여 커밋 메시지 생성"""
+        header, prompt = self._build_prompt_parts(changes, config)
+        
+        ai_config = config.get('ai') or {}
+        model = ai_config.get('model', 'claude-3-sonnet-20240229')
+        temperature = ai_config.get('temperature', 0.3)
+        max_tokens = ai_config.get('max_tokens', 500)
+        
+        try:
+            if self.async_client is None:
+                import anthropic
+                self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
             
-            prompt += f"\nFile: {change.path} ({change_symbol})\n"
-            prompt += f"Stats: +{change.insertions} / -{change.deletions} lines\n"
+            response = await self.async_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=[
+                    {
+                        "type": "text",
+                        "text": self.system_prompt
+                    },
+                    {
+                        "type": "text",
+                        "text": header,
+                        "cache_control": {"type": "ephemeral"}
+                    }
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            )
             
-            # Diff 내용을 더 상세히 포함
-            if change.diff:
-                diff_lines = change.diff.split('\n')
-                
-                # 모든 변경사항 포함 (제한을 크게 늘림)
-                added_lines = []
-                removed_lines = []
-                new_methods = []
-                endpoints = []
-                
-                for line in diff_lines[:200]:  # 처음 200줄까지 확장
-                    if line.startswith('+') and not line.startswith('+++'):
-                        added_line = line[1:].strip()
-                        added_lines.append(added_line)
-                        # 새로운 메서드/함수 감지
-                        if any(keyword in added_line for keyword in ['public ', 'private ', 'protected ', 'def ', 'function ', 'async ', '@']):
-                            if '(' in added_line:
-                                new_methods.append(added_line)
-                        # 엔드포인트/매핑 어노테이션 감지
-                        if added_line.startswith('@') and any(marker in added_line for marker in ['Mapping', 'RequestMapping', 'Path', 'Route']):
-                            endpoints.append(added_line)
-                    elif line.startswith('-') and not line.startswith('---'):
-                        removed_lines.append(line[1:].strip())
-                
-                # 🚨 새 메서드가 많으면 반드시 강조
-                if new_methods:
-                    prompt += f"\n⚠️  DETECTED {len(new_methods)} NEW METHODS/FUNCTIONS - This is likely a FEAT, not refactor!\n"
-                    prompt += "New methods:\n"
-                    for method in new_methods[:10]:
-                        prompt += f"  + {method[:120]}\n"
-                # 📌 감지된 엔드포인트/어노테이션 노출
-                if endpoints:
-                    prompt += "Detected endpoints/annotations:\n"
-                    for ep in endpoints[:8]:
-                        prompt += f"  + {ep[:120]}\n"
-                
-                if added_lines or removed_lines:
-                    prompt += "\nKey changes:\n"
-                    
-                    if added_lines:
-                        prompt += f"  ADDED ({len(added_lines)} lines):\n"
-                        for line in added_lines[:20]:  # 추가된 줄 20개로 확대
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    + {line[:120]}\n"
-                    
-                    if removed_lines:
-                        prompt += f"  REMOVED ({len(removed_lines)} lines):\n"
-                        for line in removed_lines[:10]:  # 삭제된 줄 10개
-                            if line and len(line) > 3:  # 빈 줄 제외
-                                prompt += f"    - {line[:100]}\n"
-        
-        prompt += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        prompt += "\n🎯 YOUR TASK: Read the ACTUAL method names above and write a commit message.\n\n"
-        prompt += "📖 STEP 1: Look at 'DETECTED NEW METHODS/FUNCTIONS' section.\n"
-        prompt += "   Extract ACTION from each method name:\n"
-        prompt += "   - Method name format: `actionSubject` (e.g., `getUserData`, `validateEmail`, `exportReport`)\n"
-        prompt += "   - Extract: action + what (e.g., 'get user data', 'validate email', 'export report')\n\n"
-        prompt += "🚨 CRITICAL: Use ONLY what you see in the actual method names. Do NOT invent!\n\n"
-        prompt += "📝 STEP 2: Decide commit type.\n"
-        prompt += "   - NEW public methods/APIs → `feat:`\n"
-        prompt += "   - Code restructure only → `refactor:`\n\n"
-        prompt += "✍️ STEP 3: Write message (max 60 chars).\n"
-        prompt += "   Format: `feat: add [action1], [action2]`\n"
-        prompt += "   Example pattern: `feat: add user retrieval, email validation`\n\n"
-        prompt += "❌ FORBIDDEN: endpoint, resource, service, logic, functionality, operations\n"
-        prompt += "✅ ALLOWED: list, get, compare, transfer, export, validate, import, delete\n\n"
-        prompt += "Write commit message based on ACTUAL method names:"
-        
-        return prompt
+            return response.content[0].text.strip()
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API 호출 실패: {e}")
+    
+    async def aclose(self) -> None:
+        """AsyncAnthropic 클라이언트 정리"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
 
 
 class CommitMessageGenerator:
     """커밋 메시지 생성기 메인 클래스"""
     
-    def __init__(self, provider: str = "openai", api_key: Optional[str] = None):
+    def __init__(self, provider: str = "openai", api_key: Optional[str] = None,
+                 system_prompt: Optional[str] = None, client=None,
+                 cache: Optional[ResponseCache] = None):
         """
         Args:
             provider: 'openai', 'anthropic', 또는 'gemini'
             api_key: API 키 (None이면 환경 변수에서 가져옴)
+            system_prompt: 시스템 프롬프트 (None이면 기본 SYSTEM_PROMPT)
+            client: 미리 생성된 SDK 클라이언트 (None이면 새로 생성)
+            cache: 커밋 메시지 캐시 (None이면 기본 디스크 캐시)
         """
+        self.provider_name = provider
+        self.cache = cache if cache is not None else ResponseCache()
+        
         if api_key is None:
             if provider == "openai":
                 api_key = os.getenv("OPENAI_API_KEY")
@@ -517,21 +766,139 @@ class CommitMessageGenerator:
             else:
                 raise ValueError(f"지원하지 않는 provider: {provider}")
         
+        system_prompt = system_prompt or SYSTEM_PROMPT
+        self.system_prompt = system_prompt
+        
         if provider == "openai":
-            self.provider = OpenAIProvider(api_key)
+            self.provider = OpenAIProvider(api_key, system_prompt, client)
         elif provider == "anthropic":
-            self.provider = AnthropicProvider(api_key)
+            self.provider = AnthropicProvider(api_key, system_prompt, client)
         elif provider == "gemini":
-            self.provider = GeminiProvider(api_key)
+            self.provider = GeminiProvider(api_key, system_prompt, client)
         else:
             raise ValueError(f"지원하지 않는 provider: {provider}. 'openai', 'anthropic', 또는 'gemini'를 사용하세요.")
     
-    def generate(self, changes: List[FileChange], config: dict) -> str:
-        """커밋 메시지 생성"""
+    def generate(self, changes: List[FileChange], config: dict,
+                 on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        커밋 메시지 생성
+        
+        Args:
+            changes: 변경사항 목록
+            config: 설정
+            on_token: 스트리밍 콜백 (지정하면 응답 토큰이 도착할 때마다 호출)
+        """
+        if not changes:
+            raise ValueError("변경사항이 없습니다.")
+        
+        # 이름 변경/공백 정리/짧은 새 파일처럼 단순한 변경은 AI 호출 없이 템플릿 메시지
+        commit_config = config.get('commit') or {}
+        if commit_config.get('trivial_messages', True) and commit_config.get('conventional_commits', True):
+            message = _try_trivial_message(changes)
+            if message is not None:
+                if on_token is not None:
+                    on_token(message)
+                return message
+        
+        # 같은 변경사항(순서 무관) + provider/모델/생성 설정이면 API 호출 없이 이전 메시지 재사용
+        cache_key = None
+        if (config.get('cache') or {}).get('enabled', True):
+            cache_key = self._cache_key(changes, config)
+            message = self.cache.get(cache_key)
+            if message is not None:
+                if on_token is not None:
+                    on_token(message)
+                return message
+        
+        if on_token is None:
+            message = self.provider.generate_commit_message(changes, config)
+        else:
+            chunks = []
+            for chunk in self.provider.generate_commit_message_stream(changes, config):
+                chunks.append(chunk)
+                on_token(chunk)
+            message = "".join(chunks).strip()
+        
+        if cache_key is not None and message:
+            self.cache.set(cache_key, message)
+        return message
+    
+    def generate_many(self, changes: List[FileChange], config: dict, n: int = 3) -> List[str]:
+        """
+        커밋 메시지 후보 여러 개 생성 (사용자가 고를 수 있도록)
+        
+        OpenAI는 n, Gemini는 candidate_count로 한 번의 요청에서 생성하고
+        Anthropic은 요청을 동시에 n번 보냅니다.
+        """
+        if not changes:
+            raise ValueError("변경사항이 없습니다.")
+        if n < 1:
+            raise ValueError("n은 1 이상이어야 합니다.")
+        
+        return self.provider.generate_commit_messages(changes, config, n)
+    
+    @staticmethod
+    async def generate_race_async(generators: List["CommitMessageGenerator"],
+                                  changes: List[FileChange], config: dict) -> str:
+        """
+        여러 생성기(provider)에 동시에 요청하고 가장 먼저 성공한 메시지 반환
+        
+        실패한 요청은 건너뛰고 나머지를 계속 기다리며 (fallback), 결과가 나오면 남은 요청은 취소합니다.
+        
+        Args:
+            generators: 경쟁시킬 생성기 목록 (예: openai, anthropic, gemini)
+            changes: 변경사항 목록
+            config: 설정
+        """
+        import asyncio
+        
+        if not changes:
+            raise ValueError("변경사항이 없습니다.")
+        
+        pending = {
+            asyncio.ensure_future(generator.provider.generate_commit_message_async(changes, config)): generator
+            for generator in generators
+        }
+        errors = []
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    generator = pending.pop(task)
+                    if task.exception() is None and task.result():
+                        return task.result()
+                    errors.append(f"{generator.provider_name}: {task.exception() or '빈 응답'}")
+            raise RuntimeError(f"모든 provider 호출 실패: {'; '.join(errors)}")
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.gather(*(generator.provider.aclose() for generator in generators),
+                                 return_exceptions=True)
+    
+    @staticmethod
+    def generate_race(generators: List["CommitMessageGenerator"],
+                      changes: List[FileChange], config: dict) -> str:
+        """generate_race_async의 동기 래퍼 (실행 중인 이벤트 루프 밖에서 호출)"""
+        import asyncio
+        return asyncio.run(CommitMessageGenerator.generate_race_async(generators, changes, config))
+    
+    def _cache_key(self, changes: List[FileChange], config: dict) -> str:
+        """커밋 메시지 캐시 키 (경로순 정렬한 변경사항 해시 + 생성에 영향을 주는 설정)"""
+        ai_config = config.get('ai') or {}
+        return ResponseCache.make_key(
+            'commit-message', self.provider_name,
+            str(ai_config.get('model', '')), str(ai_config.get('temperature', '')),
+            str(ai_config.get('max_tokens', '')), self.system_prompt,
+            ResponseCache.digest_changes(sorted(changes, key=attrgetter('path')))
+        )
+    
+    def generate_stream(self, changes: List[FileChange], config: dict) -> Iterator[str]:
+        """커밋 메시지 스트리밍 생성 (토큰이 도착하는 대로 반환)"""
         if not changes:
             raise ValueError("변경사항이 없습니다.")
         
-        return self.provider.generate_commit_message(changes, config)
+        return self.provider.generate_commit_message_stream(changes, config)
 
 
 if __name__ == "__main__":
@@ -564,10 +931,10 @@ if __name__ == "__main__":
     
     # 커밋 메시지 생성
     generator = CommitMessageGenerator(provider=provider)
-    message = generator.generate(all_changes, config)
     
     print("\n생성된 커밋 메시지:")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-    print(message)
+    generator.generate(all_changes, config, on_token=lambda token: print(token, end="", flush=True))
+    print()
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
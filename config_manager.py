@@ -2,11 +2,73 @@
 설정 파일 및 환경 변수 관리 모듈
 """
 
+import copy
+import hashlib
 import os
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+
+from response_cache import DEFAULT_CACHE_DIR, ResponseCache, dumps, loads
+
+
+@lru_cache(maxsize=None)
+def _exists(path: str) -> bool:
+    """경로 존재 여부 (같은 경로는 프로세스당 stat 한 번만)"""
+    return os.path.exists(path)
+
+
+def _load_env(env_path: Optional[str] = None):
+    """.env 파일 로드 (우선순위: 1. 지정된 경로, 2. 현재 디렉토리, 3. ~/.auto-commit/)
+    
+    프로세스당 한 번만 로드합니다. 단, env_path를 명시하면 항상 해당 파일을 로드합니다.
+    """
+    global _DOTENV_LOADED
+    
+    from dotenv import load_dotenv
+    
+    if env_path and _exists(env_path):
+        load_dotenv(env_path)
+    elif _DOTENV_LOADED:
+        return
+    elif _exists('.env'):
+        load_dotenv('.env')
+    else:
+        # 홈 디렉토리의 전역 설정 찾기
+        home_env = Path.home() / '.auto-commit' / '.env'
+        if _exists(str(home_env)):
+            load_dotenv(home_env)
+        else:
+            load_dotenv()
+    _DOTENV_LOADED = True
+
+
+@lru_cache(maxsize=64)
+def _split_key(key: str) -> tuple:
+    """점 표기법 키 분할 ('ai.model' → ('ai', 'model'), 같은 키는 한 번만 분할)"""
+    return tuple(key.split('.'))
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """(yaml 모듈, 로더) - YAML을 실제로 파싱할 때 한 번만 import (JSON 사본을 쓰면 import 안 함)"""
+    import yaml
+    # LibYAML C 로더가 있으면 사용 (순수 Python SafeLoader보다 훨씬 빠름)
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return yaml, loader
+
+
+# 병합된 설정 캐시 ((절대 경로, 수정 시각 ns, 크기, 기본 설정 해시) -> 설정) - 파일이 그대로면 YAML 재파싱 생략
+_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+# .env를 이미 로드했는지 여부 (ConfigManager를 여러 번 만들어도 한 번만 파싱)
+_DOTENV_LOADED = False
+
+# 병합된 설정의 JSON 사본 디렉토리 (CLI를 다시 실행해도 YAML 대신 JSON만 읽음)
+CONFIG_CACHE_DIR = DEFAULT_CACHE_DIR / 'config'
 
 
 class ConfigManager:
@@ -27,6 +89,10 @@ class ConfigManager:
         'git': {
             'auto_add': False,
             'exclude_patterns': ['*.log', '*.tmp', '.env', '__pycache__/']
+        },
+        'cache': {
+            'enabled': True,
+            'ttl_hours': 24
         }
     }
     
@@ -36,29 +102,23 @@ class ConfigManager:
             config_path: config.yaml 파일 경로
             env_path: .env 파일 경로
         """
-        # .env 파일 로드 (우선순위: 1. 지정된 경로, 2. 현재 디렉토리, 3. ~/.auto-commit/)
-        if env_path and Path(env_path).exists():
-            load_dotenv(env_path)
-        elif Path('.env').exists():
-            load_dotenv('.env')
-        else:
-            # 홈 디렉토리의 전역 설정 찾기
-            home_env = Path.home() / '.auto-commit' / '.env'
-            if home_env.exists():
-                load_dotenv(home_env)
-            else:
-                load_dotenv()
+        # .env 파일 로드 (프로세스당 한 번)
+        _load_env(env_path)
+        
+        # 환경 변수에서 읽은 provider / API 키 (처음 조회할 때 한 번만 읽음)
+        self._ai_provider: Optional[str] = None
+        self._api_keys: Dict[str, str] = {}
         
         # config.yaml 로드 (우선순위: 1. 지정된 경로, 2. 현재 디렉토리, 3. ~/.auto-commit/)
         if config_path:
             self.config_path = config_path
-        elif Path('config.yaml').exists():
+        elif _exists('config.yaml'):
             self.config_path = 'config.yaml'
-        elif Path('.auto-commit.yaml').exists():
+        elif _exists('.auto-commit.yaml'):
             self.config_path = '.auto-commit.yaml'
         else:
             home_config = Path.home() / '.auto-commit' / 'config.yaml'
-            if home_config.exists():
+            if _exists(str(home_config)):
                 self.config_path = str(home_config)
             else:
                 self.config_path = 'config.yaml'
@@ -69,59 +129,131 @@ class ConfigManager:
         self._apply_env_overrides()
     
     def _load_config(self) -> Dict[str, Any]:
-        """config.yaml 파일 로드"""
-        if Path(self.config_path).exists():
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f)
-                    
-                # 기본 설정과 병합
-                return self._merge_configs(self.DEFAULT_CONFIG, config or {})
-            except Exception as e:
-                print(f"Warning: config.yaml 로드 실패, 기본 설정 사용: {e}")
-                return self.DEFAULT_CONFIG.copy()
-        else:
+        """config.yaml 파일 로드 (같은 파일이 바뀌지 않았으면 캐시된 결과의 복사본 반환)"""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
             print(f"Warning: {self.config_path} 파일이 없습니다. 기본 설정을 사용합니다.")
-            return self.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(self.DEFAULT_CONFIG)
+        
+        # 기본 설정 해시도 키에 포함 (업그레이드로 DEFAULT_CONFIG가 바뀌면 JSON 사본을 다시 만듦)
+        cache_key = (os.path.abspath(self.config_path), st.st_mtime_ns, st.st_size,
+                     ResponseCache.digest_config(self.DEFAULT_CONFIG))
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None:
+            # 환경 변수 오버라이드가 설정을 수정하므로 복사본 반환
+            return copy.deepcopy(cached)
+        
+        sidecar_path = self._sidecar_path(cache_key[0])
+        merged = self._read_sidecar(sidecar_path, cache_key)
+        if merged is not None:
+            _CONFIG_CACHE[cache_key] = merged
+            return copy.deepcopy(merged)
+        
+        try:
+            yaml, loader = _yaml_loader()
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = yaml.load(f, Loader=loader)
+                
+            # 기본 설정과 병합
+            merged = self._merge_configs(self.DEFAULT_CONFIG, config or {})
+        except Exception as e:
+            print(f"Warning: config.yaml 로드 실패, 기본 설정 사용: {e}")
+            return copy.deepcopy(self.DEFAULT_CONFIG)
+        
+        _CONFIG_CACHE[cache_key] = merged
+        self._write_sidecar(sidecar_path, cache_key, merged)
+        return copy.deepcopy(merged)
+    
+    @staticmethod
+    def _sidecar_path(abs_path: str) -> Path:
+        """설정 파일 경로별 JSON 사본 경로"""
+        name = hashlib.blake2b(abs_path.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+        return CONFIG_CACHE_DIR / f"{name}.json"
+    
+    @staticmethod
+    def _read_sidecar(sidecar_path: Path, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        """JSON 사본 읽기 (원본 경로/수정 시각/크기가 다르거나 읽기 실패면 None)"""
+        try:
+            with open(sidecar_path, 'rb') as f:
+                entry = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(entry, dict) or entry.get('source') != list(cache_key):
+            return None
+        return entry.get('config')
+    
+    @staticmethod
+    def _write_sidecar(sidecar_path: Path, cache_key: tuple, merged: Dict[str, Any]):
+        """JSON 사본 저장 (JSON으로 그대로 왕복되지 않는 설정이나 저장 실패는 건너뜀)"""
+        try:
+            data = dumps({'source': list(cache_key), 'config': merged})
+            if loads(data)['config'] != merged:
+                return
+            sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, sidecar_path)
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    @classmethod
+    def clear_cache(cls):
+        """파싱된 설정 캐시 비우기 (메모리 + JSON 사본)"""
+        _CONFIG_CACHE.clear()
+        for path in CONFIG_CACHE_DIR.glob('*.json'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
     
     def _merge_configs(self, default: Dict, override: Dict) -> Dict:
-        """설정 병합 (재귀적)"""
+        """설정 병합 (중첩 dict는 재귀 호출 대신 명시적 스택으로 처리)"""
         result = default.copy()
+        stack = [(result, override)]
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                result[key] = value
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if key in target and isinstance(target[key], dict) and isinstance(value, dict):
+                    # 병합되는 중첩 dict만 복사 (기본 설정 원본은 수정하지 않음)
+                    target[key] = target[key].copy()
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         
         return result
     
     def _apply_env_overrides(self):
         """환경 변수로 설정 오버라이드"""
         # AI 모델
-        if os.getenv('AI_MODEL'):
-            self.config['ai']['model'] = os.getenv('AI_MODEL')
+        model = os.getenv('AI_MODEL')
+        if model:
+            self.config['ai']['model'] = model
         
         # Temperature
-        if os.getenv('AI_TEMPERATURE'):
+        temperature = os.getenv('AI_TEMPERATURE')
+        if temperature:
             try:
-                self.config['ai']['temperature'] = float(os.getenv('AI_TEMPERATURE'))
+                self.config['ai']['temperature'] = float(temperature)
             except ValueError:
                 pass
         
         # Max tokens
-        if os.getenv('AI_MAX_TOKENS'):
+        max_tokens = os.getenv('AI_MAX_TOKENS')
+        if max_tokens:
             try:
-                self.config['ai']['max_tokens'] = int(os.getenv('AI_MAX_TOKENS'))
+                self.config['ai']['max_tokens'] = int(max_tokens)
             except ValueError:
                 pass
     
     def get(self, key: str, default: Any = None) -> Any:
         """설정 값 가져오기 (점 표기법 지원)"""
-        keys = key.split('.')
         value = self.config
         
-        for k in keys:
+        for k in _split_key(key):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
@@ -130,20 +262,28 @@ class ConfigManager:
         return value
     
     def get_ai_provider(self) -> str:
-        """AI 제공자 가져오기"""
+        """AI 제공자 가져오기 (AI_PROVIDER는 처음 한 번만 읽음)"""
+        if self._ai_provider is not None:
+            return self._ai_provider
+        
         provider = os.getenv('AI_PROVIDER', 'openai').lower()
         
         if provider not in ['openai', 'anthropic', 'gemini']:
             print(f"Warning: 지원하지 않는 AI_PROVIDER '{provider}', 'openai' 사용")
-            return 'openai'
+            provider = 'openai'
         
+        self._ai_provider = provider
         return provider
     
     def get_api_key(self, provider: Optional[str] = None) -> str:
-        """API 키 가져오기"""
+        """API 키 가져오기 (provider별로 처음 한 번만 읽음)"""
         if provider is None:
             provider = self.get_ai_provider()
         
+        api_key = self._api_keys.get(provider)
+        if api_key:
+            return api_key
+        
         if provider == 'openai':
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
@@ -168,6 +308,7 @@ class ConfigManager:
         else:
             raise ValueError(f"지원하지 않는 provider: {provider}")
         
+        self._api_keys[provider] = api_key
         return api_key
     
     def validate(self) -> bool:
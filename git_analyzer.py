@@ -3,15 +3,98 @@ Git 변경사항 분석 모듈
 Git 저장소의 변경사항을 분석하고 diff 정보를 추출합니다.
 """
 
-import git
-from typing import List, Dict, Optional
+import logging
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional
 from pathlib import Path
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    import git
+
+# 분석 진행 로그는 DEBUG (auto_commit --verbose), 처리하지 못한 파일은 WARNING
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _git_sdk():
+    """GitPython 모듈 (커밋 생성 등 index API가 필요할 때 한 번만 import)"""
+    import git
+    return git
+
+
+# git 경로('/' 구분)를 OS 경로로 바꿀 필요가 있는지 (POSIX에서는 그대로 사용)
+_NEEDS_SEP_FIX = os.sep != '/'
+
+# git add --pathspec-from-file 최소 지원 버전 (이전 버전은 명령행 인자로 나눠서 전달)
+_PATHSPEC_FROM_FILE_VERSION = (2, 26)
+
+# 명령행 인자로 경로를 넘길 때 한 번에 넘길 최대 경로 수 (Windows 명령행 길이 제한 대비)
+_ADD_CHUNK_SIZE = 200
+
+
+@lru_cache(maxsize=1)
+def _git_version() -> tuple:
+    """설치된 git 버전 (예: (2, 39)) - 확인하지 못하면 (0, 0)"""
+    try:
+        output = subprocess.run(['git', 'version'], capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return (0, 0)
+    match = re.search(rb'(\d+)\.(\d+)', output)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+
+# git이 따옴표로 감싼 경로의 C 스타일 이스케이프 (\", \\, \t, \n, \ooo)
+_QUOTED_ESCAPE_RE = re.compile(r'\\([0-7]{3}|.)')
+_QUOTED_ESCAPES = {'a': '\a', 'b': '\b', 't': '\t', 'n': '\n', 'v': '\v', 'f': '\f', 'r': '\r'}
+
+
+def _unquote_path(path: str) -> str:
+    """git diff 헤더의 경로 따옴표/이스케이프 해제 ("a/q\"x.txt" -> a/q"x.txt)"""
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    
+    def replace(match):
+        escaped = match.group(1)
+        if len(escaped) == 3:
+            # 8진수는 UTF-8 바이트 단위이므로 latin-1로 모았다가 아래에서 다시 디코딩
+            return chr(int(escaped, 8))
+        return _QUOTED_ESCAPES.get(escaped, escaped)
+    
+    unquoted = _QUOTED_ESCAPE_RE.sub(replace, path[1:-1])
+    try:
+        return unquoted.encode('latin-1').decode('utf-8')
+    except UnicodeError:
+        # 이스케이프되지 않은 비ASCII 문자가 섞인 경우 (core.quotePath=false)
+        return unquoted
+
+
+# git diff --shortstat 항목 ("3 files changed", "10 insertions(+)", "1 deletion(-)")
+_SHORTSTAT_RE = re.compile(r'(\d+) (file|insertion|deletion)')
+
+
+def _read_text(full_path: str) -> Optional[str]:
+    """파일 내용 읽기 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("Could not read %s: %s", full_path, e)
+        return None
+
 
 @dataclass
 class FileChange:
     """파일 변경 정보"""
+    # 인스턴스 __dict__ 없이 고정 슬롯 사용 (변경 파일이 많을 때 메모리 절약)
+    __slots__ = ('path', 'change_type', 'insertions', 'deletions', 'diff')
+    
     path: str
     change_type: str  # 'A'(added), 'M'(modified), 'D'(deleted), 'R'(renamed)
     insertions: int
@@ -22,6 +105,8 @@ class FileChange:
 @dataclass
 class GitChanges:
     """Git 변경사항 정보"""
+    __slots__ = ('staged_files', 'unstaged_files', 'total_insertions', 'total_deletions', 'total_files')
+    
     staged_files: List[FileChange]
     unstaged_files: List[FileChange]
     total_insertions: int
@@ -38,60 +123,111 @@ class GitAnalyzer:
             repo_path: Git 저장소 경로 (None이면 현재 디렉토리)
         """
         self.repo_path = repo_path or "."
+        # 분석 경로는 git 명령을 직접 실행 (GitPython Repo는 필요할 때만 생성)
         try:
-            self.repo = git.Repo(self.repo_path, search_parent_directories=True)
-        except git.InvalidGitRepositoryError:
+            self.working_dir = subprocess.run(
+                ['git', '-C', self.repo_path, 'rev-parse', '--show-toplevel'],
+                capture_output=True,
+                check=True
+            ).stdout.decode('utf-8', errors='replace').strip()
+        except subprocess.CalledProcessError:
             raise ValueError(f"'{self.repo_path}'는 유효한 Git 저장소가 아닙니다.")
+        self._repo = None
+    
+    @property
+    def repo(self) -> "git.Repo":
+        """GitPython 저장소 (처음 접근할 때 생성)"""
+        if self._repo is None:
+            self._repo = _git_sdk().Repo(self.working_dir)
+        return self._repo
+    
+    def _git_output(self, *args: str) -> str:
+        """git 명령 실행 후 stdout 반환 (마지막 줄바꿈 하나 제거, 실패 시 CalledProcessError)"""
+        output = subprocess.run(
+            ['git', *args],
+            cwd=self.working_dir,
+            capture_output=True,
+            check=True
+        ).stdout.decode('utf-8', errors='replace')
+        return output[:-1] if output.endswith('\n') else output
     
-    def get_staged_changes(self) -> List[FileChange]:
-        """Staged 변경사항 가져오기"""
+    def get_staged_changes(self, patches: bool = True) -> List[FileChange]:
+        """Staged 변경사항 가져오기
+        
+        Args:
+            patches: False면 patch 텍스트 없이 경로/상태/라인 수만 채움 (diff='')
+        """
         changes = []
-        import os
         
-        # git status --porcelain을 사용하여 정확한 상태 확인
+        # git status --porcelain -z를 사용하여 정확한 상태 확인 (경로 따옴표/이스케이프 없음)
         try:
-            status_output = self.repo.git.status('--porcelain').split('\n')
+            entries = iter(self._git_output('status', '--porcelain', '-z').split('\0'))
             staged_files = {}
             
-            for line in status_output:
-                if len(line) < 4:
+            for entry in entries:
+                if len(entry) < 4:
                     continue
-                status_code = line[:2]
-                file_path = line[3:]
+                status_code = entry[:2]
+                file_path = entry[3:]
                 
                 # staged 파일 (첫 번째 문자가 상태)
                 first_char = status_code[0]
+                if first_char in ('R', 'C'):
+                    # -z 형식에서 이름 변경/복사는 원래 경로가 다음 항목
+                    next(entries, None)
                 if first_char in ['A', 'M', 'D', 'R']:
                     staged_files[file_path] = first_char
             
-            print(f"🔍 Found {len(staged_files)} staged files from git status")
+            logger.debug("🔍 Found %d staged files from git status", len(staged_files))
+            
+            if not patches:
+                # 이름/통계만 필요한 경우: patch 생성 없이 numstat 한 번으로 라인 수 계산
+                numstat = self._get_numstat(cached=True)
+                for file_path, status in staged_files.items():
+                    if status not in ('A', 'M', 'D'):
+                        continue
+                    insertions, deletions = numstat.get(file_path, (0, 0))
+                    changes.append(FileChange(
+                        path=file_path,
+                        change_type=status,
+                        insertions=insertions,
+                        deletions=deletions,
+                        diff=''
+                    ))
+                return changes
+            
+            # 수정/삭제 파일 patch는 git diff --cached 한 번으로 가져와 파일별로 분리
+            path_patches = self._get_path_patches(
+                [file_path for file_path, status in staged_files.items() if status in ('M', 'D')],
+                cached=True
+            )
+            # 라인 수는 git diff --numstat 한 번으로 (patch 줄 단위 Python 스캔 대신)
+            numstat = self._get_numstat(cached=True)
+            # 새 파일 내용은 한꺼번에 (여러 개면 스레드로 동시에) 읽기
+            new_files = [file_path for file_path, status in staged_files.items() if status == 'A']
+            contents = dict(zip(new_files, self._read_files(new_files)))
             
             # 각 staged 파일 처리
             for file_path, status in staged_files.items():
                 try:
-                    full_path = os.path.join(self.repo.working_dir, file_path.replace('/', os.sep))
-                    
                     if status == 'A':  # 새 파일 추가
-                        if os.path.exists(full_path):
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                            
-                            diff_lines = [f'+{line}' for line in content.split('\n')]
-                            diff_text = '\n'.join(diff_lines)
+                        content = contents.get(file_path)
+                        if content is not None:
+                            diff_text, insertions = self._added_file_diff(content)
                             
                             changes.append(FileChange(
                                 path=file_path,
                                 change_type='A',
-                                insertions=len(content.split('\n')),
+                                insertions=insertions,
                                 deletions=0,
                                 diff=diff_text
                             ))
-                            print(f"  ✅ New file: {file_path} (+{len(content.split('\n'))} lines)")
+                            logger.debug("  ✅ New file: %s (+%d lines)", file_path, insertions)
                         
                     elif status == 'M':  # 수정된 파일
-                        # git diff --cached로 실제 변경사항 가져오기
-                        diff_output = self.repo.git.diff('--cached', file_path)
-                        insertions, deletions = self._count_changes(diff_output)
+                        # git diff --cached로 가져온 실제 변경사항
+                        diff_output = path_patches.get(file_path, '')
+                        insertions, deletions = numstat.get(file_path) or self._count_changes(diff_output)
                         
                         changes.append(FileChange(
                             path=file_path,
@@ -100,11 +236,11 @@ class GitAnalyzer:
                             deletions=deletions,
                             diff=diff_output
                         ))
-                        print(f"  ✅ Modified: {file_path} (+{insertions}/-{deletions} lines)")
+                        logger.debug("  ✅ Modified: %s (+%d/-%d lines)", file_path, insertions, deletions)
                         
                     elif status == 'D':  # 삭제된 파일
-                        diff_output = self.repo.git.diff('--cached', file_path)
-                        insertions, deletions = self._count_changes(diff_output)
+                        diff_output = path_patches.get(file_path, '')
+                        insertions, deletions = numstat.get(file_path) or self._count_changes(diff_output)
                         
                         changes.append(FileChange(
                             path=file_path,
@@ -113,18 +249,34 @@ class GitAnalyzer:
                             deletions=deletions,
                             diff=diff_output
                         ))
-                        print(f"  ✅ Deleted: {file_path} (+{insertions}/-{deletions} lines)")
+                        logger.debug("  ✅ Deleted: %s (+%d/-%d lines)", file_path, insertions, deletions)
                         
                 except Exception as e:
-                    print(f"Warning: Could not process {file_path}: {e}")
+                    logger.warning("Could not process %s: %s", file_path, e)
                     
         except Exception as e:
-            print(f"Error getting staged changes: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error getting staged changes: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return changes
     
+    def _full_path(self, path: str) -> str:
+        """git 경로('/' 구분)를 작업 트리 기준 절대 경로로 변환"""
+        if _NEEDS_SEP_FIX:
+            path = path.replace('/', os.sep)
+        return os.path.join(self.working_dir, path)
+    
+    def _read_files(self, paths: List[str]) -> List[Optional[str]]:
+        """작업 트리 파일 내용을 순서대로 읽기 (없거나 읽을 수 없으면 None)
+        
+        여러 파일은 스레드 풀로 동시에 읽습니다. (파일 I/O 동안 GIL이 풀림)
+        """
+        full_paths = [self._full_path(path) for path in paths]
+        if len(full_paths) < 2:
+            return [_read_text(full_path) for full_path in full_paths]
+        
+        with ThreadPoolExecutor(max_workers=min(32, len(full_paths))) as executor:
+            return list(executor.map(_read_text, full_paths))
+    
     def _parse_file_path(self, path_str: str) -> str:
         """파일 경로 파싱 및 정규화 (따옴표 제거, 이스케이프 처리)"""
         if not path_str:
@@ -147,16 +299,19 @@ class GitAnalyzer:
         
         return path_str
     
-    def get_unstaged_changes(self) -> List[FileChange]:
-        """Unstaged 변경사항 가져오기 (git status + git diff 사용)"""
+    def get_unstaged_changes(self, patches: bool = True) -> List[FileChange]:
+        """Unstaged 변경사항 가져오기 (git status + git diff 사용)
+        
+        Args:
+            patches: False면 patch 텍스트 없이 경로/상태/라인 수만 채움 (diff='')
+        """
         changes = []
         
         try:
             # git status --porcelain -z로 null-separated 경로 가져오기 (특수문자 안전 처리)
-            import subprocess
             result = subprocess.run(
                 ['git', 'status', '--porcelain', '-z'],
-                cwd=self.repo.working_dir,
+                cwd=self.working_dir,
                 capture_output=True,
                 text=False  # 바이너리 모드로 받아서 null 문자 처리
             )
@@ -181,23 +336,41 @@ class GitAnalyzer:
                         file_path = self._parse_file_path(file_path)
                         unstaged_files.append((status_code, file_path))
             
-            print(f"🔍 Found {len(unstaged_files)} unstaged files from git status")
+            logger.debug("🔍 Found %d unstaged files from git status", len(unstaged_files))
+            
+            if not patches:
+                # 이름/통계만 필요한 경우: patch 생성 없이 numstat 한 번으로 라인 수 계산
+                numstat = self._get_numstat(cached=False)
+                for status_code, file_path in unstaged_files:
+                    insertions, deletions = numstat.get(file_path, (0, 0))
+                    changes.append(FileChange(
+                        path=file_path,
+                        change_type=status_code,
+                        insertions=insertions,
+                        deletions=deletions,
+                        diff=''
+                    ))
+                return changes
+            
+            # 수정/삭제 파일 patch는 git diff 한 번으로 가져와 파일별로 분리
+            path_patches = self._get_path_patches(
+                [file_path for status_code, file_path in unstaged_files if status_code in ('M', 'D')],
+                cached=False
+            )
+            # 라인 수는 git diff --numstat 한 번으로 (patch 줄 단위 Python 스캔 대신)
+            numstat = self._get_numstat(cached=False)
+            # 새 파일 내용은 한꺼번에 (여러 개면 스레드로 동시에) 읽기
+            new_files = [file_path for status_code, file_path in unstaged_files if status_code == 'A']
+            contents = dict(zip(new_files, self._read_files(new_files)))
             
             # 각 파일의 diff 가져오기
             for status_code, file_path in unstaged_files:
                 try:
                     if status_code == 'M':
-                        # 수정된 파일: git diff로 읽기
-                        diff_result = subprocess.run(
-                            ['git', 'diff', '--', file_path],
-                            cwd=self.repo.working_dir,
-                            capture_output=True,
-                            text=True,
-                            encoding='utf-8'
-                        )
-                        diff_text = diff_result.stdout
-                        insertions, deletions = self._count_changes(diff_text)
-                        print(f"  ✅ Modified: {file_path} (+{insertions}/-{deletions} lines)")
+                        # 수정된 파일: git diff 결과
+                        diff_text = path_patches.get(file_path, '')
+                        insertions, deletions = numstat.get(file_path) or self._count_changes(diff_text)
+                        logger.debug("  ✅ Modified: %s (+%d/-%d lines)", file_path, insertions, deletions)
                         
                         changes.append(FileChange(
                             path=file_path,
@@ -209,16 +382,9 @@ class GitAnalyzer:
                     
                     elif status_code == 'D':
                         # 삭제된 파일
-                        diff_result = subprocess.run(
-                            ['git', 'diff', '--', file_path],
-                            cwd=self.repo.working_dir,
-                            capture_output=True,
-                            text=True,
-                            encoding='utf-8'
-                        )
-                        diff_text = diff_result.stdout
-                        insertions, deletions = self._count_changes(diff_text)
-                        print(f"  ✅ Deleted: {file_path} (+{insertions}/-{deletions} lines)")
+                        diff_text = path_patches.get(file_path, '')
+                        insertions, deletions = numstat.get(file_path) or self._count_changes(diff_text)
+                        logger.debug("  ✅ Deleted: %s (+%d/-%d lines)", file_path, insertions, deletions)
                         
                         changes.append(FileChange(
                             path=file_path,
@@ -229,42 +395,65 @@ class GitAnalyzer:
                         ))
                     
                     elif status_code == 'A':
-                        # 새 파일 (untracked): 전체 내용 읽기
-                        import os
-                        full_path = os.path.join(self.repo.working_dir, file_path.replace('/', os.sep))
-                        
-                        if os.path.exists(full_path):
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
+                        # 새 파일 (untracked): 전체 내용
+                        content = contents.get(file_path)
+                        if content:
+                            diff_text, insertions = self._added_file_diff(content)
+                            logger.debug("  ✅ New file: %s (+%d lines)", file_path, insertions)
                             
-                            if content:
-                                diff_lines = [f'+{line}' for line in content.split('\n')]
-                                diff_text = '\n'.join(diff_lines)
-                                insertions = len(content.split('\n'))
-                                print(f"  ✅ New file: {file_path} (+{insertions} lines)")
-                                
-                                changes.append(FileChange(
-                                    path=file_path,
-                                    change_type='A',
-                                    insertions=insertions,
-                                    deletions=0,
-                                    diff=diff_text
-                                ))
+                            changes.append(FileChange(
+                                path=file_path,
+                                change_type='A',
+                                insertions=insertions,
+                                deletions=0,
+                                diff=diff_text
+                            ))
                 
                 except Exception as e:
-                    print(f"  ❌ Error processing {file_path}: {e}")
+                    logger.warning("Error processing %s: %s", file_path, e)
                     continue
         
         except Exception as e:
-            print(f"❌ Error in get_unstaged_changes: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error in get_unstaged_changes: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
         
         return changes
     
+    def _get_numstat(self, cached: bool = False) -> Dict[str, tuple]:
+        """`git diff --numstat` 한 번으로 파일별 (삽입, 삭제) 라인 수 가져오기
+        
+        patch 본문을 만들지 않으므로 이름/통계만 필요할 때 훨씬 가볍습니다.
+        rename 감지는 끄고(--no-renames) 바이너리 파일은 (0, 0)으로 처리합니다.
+        """
+        cmd = ['git', '-c', 'core.quotePath=false', 'diff', '--numstat', '-z', '--no-renames', '--no-ext-diff']
+        if cached:
+            cmd.append('--cached')
+        
+        result = subprocess.run(
+            cmd,
+            cwd=self.working_dir,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            return {}
+        
+        # 형식: <삽입>\t<삭제>\t<경로>\0 (바이너리는 -\t-)
+        stats = {}
+        for entry in result.stdout.decode('utf-8', errors='replace').split('\0'):
+            parts = entry.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            added, removed, path = parts
+            stats[path] = (
+                int(added) if added.isdigit() else 0,
+                int(removed) if removed.isdigit() else 0
+            )
+        
+        return stats
+    
     def get_untracked_files(self) -> List[str]:
-        """Untracked 파일 목록 가져오기"""
-        return self.repo.untracked_files
+        """Untracked 파일 목록 가져오기 (.gitignore 제외)"""
+        output = self._git_output('ls-files', '--others', '--exclude-standard', '-z')
+        return [path for path in output.split('\0') if path]
     
     def _parse_diff_item(self, diff_item, is_new: bool = False) -> Optional[FileChange]:
         """Diff 항목 파싱"""
@@ -282,51 +471,46 @@ class GitAnalyzer:
             # 파일 경로
             path = diff_item.b_path if diff_item.b_path else diff_item.a_path
             
-            print(f"🔍 Parsing: {path} (type={change_type}, new_file={diff_item.new_file})")
+            logger.debug("🔍 Parsing: %s (type=%s, new_file=%s)", path, change_type, diff_item.new_file)
             
             # 새 파일(A)은 무조건 파일에서 직접 읽기
             if change_type == 'A':
                 try:
                     import os
-                    full_path = os.path.join(self.repo.working_dir, path.replace('/', os.sep))
-                    print(f"  → Trying to read: {full_path}")
-                    print(f"  → File exists: {os.path.exists(full_path)}")
+                    full_path = self._full_path(path)
+                    logger.debug("  → Trying to read: %s", full_path)
                     
                     if os.path.exists(full_path):
                         with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
                             content = f.read()
                         
-                        print(f"  → File size: {len(content)} chars")
+                        logger.debug("  → File size: %d chars", len(content))
                         
                         if content:
                             # 전체 내용을 + 형태로 변환 (diff 형식)
-                            diff_lines = [f'+{line}' for line in content.split('\n')]
-                            diff_text = '\n'.join(diff_lines)
-                            insertions = len(content.split('\n'))
+                            diff_text, insertions = self._added_file_diff(content)
                             deletions = 0
-                            print(f"  ✅ Read successfully: +{insertions} lines")
+                            logger.debug("  ✅ Read successfully: +%d lines", insertions)
                         else:
-                            print(f"  ⚠️  File is EMPTY")
+                            logger.debug("  ⚠️  File is EMPTY")
                             diff_text = ""
                             insertions = 0
                             deletions = 0
                     else:
-                        print(f"  ⚠️  File NOT FOUND, trying diff...")
+                        logger.debug("  ⚠️  File NOT FOUND, trying diff...")
                         # 파일이 없으면 diff에서 가져오기 시도
                         diff_text = self._get_diff_text(diff_item)
                         insertions, deletions = self._count_changes(diff_text)
-                        print(f"  → From diff: +{insertions}/-{deletions} lines")
+                        logger.debug("  → From diff: +%d/-%d lines", insertions, deletions)
                 except Exception as e:
-                    print(f"  ❌ Error reading file: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning("Error reading file %s: %s", path, e, exc_info=logger.isEnabledFor(logging.DEBUG))
                     diff_text = self._get_diff_text(diff_item)
                     insertions, deletions = self._count_changes(diff_text)
             else:
                 # 수정/삭제/이름변경은 diff에서 가져오기
                 diff_text = self._get_diff_text(diff_item)
                 insertions, deletions = self._count_changes(diff_text)
-                print(f"  → From diff: +{insertions}/-{deletions} lines")
+                logger.debug("  → From diff: +%d/-%d lines", insertions, deletions)
             
             return FileChange(
                 path=path,
@@ -336,9 +520,7 @@ class GitAnalyzer:
                 diff=diff_text
             )
         except Exception as e:
-            print(f"❌ Failed to parse: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Failed to parse diff item: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
     def _get_diff_text(self, diff_item) -> str:
@@ -356,46 +538,46 @@ class GitAnalyzer:
                     return str(diff_data)
             return ""
         except Exception as e:
-            print(f"Debug: Error getting diff text: {e}")
+            logger.debug("Error getting diff text: %s", e)
             return ""
     
+    @staticmethod
+    def _added_file_diff(content: str) -> tuple:
+        """새 파일 내용을 모든 줄이 +인 diff 텍스트로 변환 → (diff 텍스트, 줄 수)
+        
+        줄 목록을 만들지 않고 replace 한 번으로 각 줄 앞에 +를 붙입니다.
+        """
+        return '+' + content.replace('\n', '\n+'), content.count('\n') + 1
+    
     def _count_changes(self, diff_text: str) -> tuple:
-        """삽입/삭제 라인 수 계산"""
-        insertions = 0
-        deletions = 0
+        """삽입/삭제 라인 수 계산 (numstat을 쓸 수 없는 diff 텍스트용)
+        
+        줄 목록을 만들지 않고 str.count로 "\n+" / "\n-" 줄 시작을 셉니다. (+++/--- 헤더 제외)
+        """
+        insertions = diff_text.count('\n+') - diff_text.count('\n+++')
+        deletions = diff_text.count('\n-') - diff_text.count('\n---')
         
-        for line in diff_text.split('\n'):
-            if line.startswith('+') and not line.startswith('+++'):
-                insertions += 1
-            elif line.startswith('-') and not line.startswith('---'):
-                deletions += 1
+        # 첫 줄은 앞에 \n이 없으므로 따로 확인
+        if diff_text.startswith('+') and not diff_text.startswith('+++'):
+            insertions += 1
+        elif diff_text.startswith('-') and not diff_text.startswith('---'):
+            deletions += 1
         
         return insertions, deletions
     
-    def get_all_changes(self, include_untracked: bool = False) -> GitChanges:
-        """모든 변경사항 가져오기"""
-        staged = self.get_staged_changes()
-        unstaged = self.get_unstaged_changes()
+    def get_all_changes(self, include_untracked: bool = False, patches: bool = True) -> GitChanges:
+        """모든 변경사항 가져오기
+        
+        Args:
+            include_untracked: untracked 파일 포함 여부
+            patches: False면 patch 텍스트를 만들지 않음 (요약/목록 출력용).
+                     patch가 필요해지면 get_patches()로 필요한 파일만 가져옵니다.
+        """
+        staged = self.get_staged_changes(patches=patches)
+        unstaged = self.get_unstaged_changes(patches=patches)
         
         if include_untracked:
-            untracked = self.get_untracked_files()
-            for file_path in untracked:
-                # Untracked 파일을 FileChange로 변환
-                try:
-                    full_path = Path(self.repo.working_dir) / file_path
-                    if full_path.exists():
-                        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        unstaged.append(FileChange(
-                            path=file_path,
-                            change_type='A',
-                            insertions=len(content.split('\n')),
-                            deletions=0,
-                            diff=content
-                        ))
-                except Exception as e:
-                    print(f"Warning: Could not read untracked file {file_path}: {e}")
+            unstaged.extend(self._iter_untracked_changes(patches=patches))
         
         # 통계 계산
         all_files = staged + unstaged
@@ -410,6 +592,170 @@ class GitAnalyzer:
             total_files=len(all_files)
         )
     
+    def iter_changes(self, include_untracked: bool = False, patches: bool = True) -> Iterator[FileChange]:
+        """모든 변경사항을 하나씩 반환 (staged → unstaged → untracked 순서)
+        
+        get_all_changes()와 달리 전체 목록/통계를 만들지 않으며, untracked 파일은
+        소비하는 시점에 하나씩 읽습니다.
+        """
+        yield from self.get_staged_changes(patches=patches)
+        yield from self.get_unstaged_changes(patches=patches)
+        if include_untracked:
+            yield from self._iter_untracked_changes(patches=patches)
+    
+    def _iter_untracked_changes(self, patches: bool = True) -> Iterator[FileChange]:
+        """Untracked 파일을 FileChange로 변환해 하나씩 반환"""
+        for file_path in self.get_untracked_files():
+            try:
+                full_path = Path(self.working_dir) / file_path
+                if full_path.exists():
+                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                    
+                    yield FileChange(
+                        path=file_path,
+                        change_type='A',
+                        insertions=content.count('\n') + 1,
+                        deletions=0,
+                        diff=content if patches else ''
+                    )
+            except Exception as e:
+                logger.warning("Could not read untracked file %s: %s", file_path, e)
+    
+    def get_stats(self) -> tuple:
+        """(파일 수, 삽입, 삭제) 합계 - staged + unstaged, untracked 제외
+        
+        `git diff [--cached] --shortstat` 요약 한 줄만 파싱하므로 diff 크기와 무관합니다.
+        """
+        totals = [0, 0, 0]
+        for cached in (True, False):
+            cmd = ['diff', '--shortstat', '--no-renames', '--no-ext-diff']
+            if cached:
+                cmd.append('--cached')
+            try:
+                summary = self._git_output(*cmd)
+            except subprocess.CalledProcessError:
+                continue
+            # 형식: " 3 files changed, 10 insertions(+), 2 deletions(-)" (0인 항목은 생략)
+            for count, kind in _SHORTSTAT_RE.findall(summary):
+                totals[('file', 'insertion', 'deletion').index(kind)] += int(count)
+        return tuple(totals)
+    
+    def get_patches(self, files: List[FileChange], cached: bool = True) -> Dict[str, str]:
+        """여러 파일의 patch를 단일 git diff 호출로 가져오기
+        
+        `git diff [--cached] -- <paths...>`를 한 번만 실행하고 출력을 `diff --git` 헤더
+        기준으로 파일별로 나눕니다. (파일마다 git 프로세스를 띄우지 않음)
+        
+        Args:
+            files: patch를 가져올 파일 목록
+            cached: True면 staged(index) 기준, False면 working tree 기준
+        
+        Returns:
+            {파일 경로: patch 텍스트} (git이 diff를 출력하지 않은 파일은 포함되지 않음)
+        """
+        return self._get_path_patches([f.path for f in files], cached)
+    
+    def load_diffs(self, files: List[FileChange]) -> None:
+        """patches=False로 가져온 FileChange들의 diff를 필요한 시점에 채우기
+        
+        파일마다 git을 실행하지 않고 staged(index) 기준 git diff 한 번, 그래도 없는
+        파일은 working tree 기준 git diff 한 번으로 가져옵니다. (최대 2회)
+        git diff에 나오지 않는 untracked 새 파일은 파일 내용을 읽어 채웁니다.
+        """
+        patches = self.get_patches(files)
+        missing = [f for f in files if f.path not in patches]
+        if missing:
+            # staging되지 않은 파일(--staged-only 등)은 working tree 기준 patch 사용
+            patches.update(self.get_patches(missing, cached=False))
+        for f in files:
+            f.diff = patches.get(f.path, f.diff)
+        
+        # untracked 파일: patches=True일 때와 같이 파일 내용을 diff로 사용
+        untracked = [f for f in files if f.change_type == 'A' and not f.diff]
+        for f, content in zip(untracked, self._read_files([f.path for f in untracked])):
+            if content is not None:
+                f.diff = content
+    
+    def _get_path_patches(self, paths: List[str], cached: bool = True) -> Dict[str, str]:
+        """경로 목록의 patch를 단일 git diff 호출로 가져와 파일별로 분리"""
+        if not paths:
+            return {}
+        
+        # diff.noprefix / diff.mnemonicPrefix 설정과 무관하게 a/, b/ 접두사 고정 (_split_patch가 잘라냄)
+        cmd = ['git', '-c', 'core.quotePath=false', 'diff', '--no-color', '--no-ext-diff',
+               '--src-prefix=a/', '--dst-prefix=b/']
+        if cached:
+            cmd.append('--cached')
+        cmd.append('--')
+        cmd.extend(paths)
+        
+        result = subprocess.run(
+            cmd,
+            cwd=self.working_dir,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            return {}
+        
+        return self._split_patch(result.stdout)
+    
+    def _split_patch(self, raw: bytes) -> Dict[str, str]:
+        """여러 파일이 섞인 git diff 출력(bytes)을 파일별 patch로 분리
+        
+        전체 출력을 한 번에 str로 디코딩해 다시 나누지 않고, 파일 경계마다 잘라서
+        (memoryview라 복사 없음) 파일별 patch만 디코딩합니다.
+        """
+        patches = {}
+        view = memoryview(raw)
+        start = 0
+        
+        while start < len(raw):
+            end = raw.find(b'\ndiff --git ', start)
+            if end == -1:
+                end = len(raw)
+            # 끝의 줄바꿈은 디코딩 전에 제외
+            stop = end
+            while stop > start and raw[stop - 1] == 0x0a:
+                stop -= 1
+            chunk = str(view[start:stop], 'utf-8', 'replace')
+            start = end + 1
+            
+            if not chunk.strip():
+                continue
+            if not chunk.startswith('diff --git '):
+                chunk = 'diff --git ' + chunk
+            
+            path = None
+            for line in chunk.split('\n', 8)[1:8]:
+                if line.startswith('@@'):
+                    break
+                # 이름 변경은 새 경로 기준 (내용이 같으면 ---/+++ 라인이 없음)
+                if line.startswith('rename to '):
+                    path = _unquote_path(line[len('rename to '):])
+                    break
+                # +++ b/<path> (삭제 파일은 --- a/<path>), 특수 문자가 있으면 따옴표로 감쌈
+                if line.startswith('+++ ') and line != '+++ /dev/null':
+                    path = _unquote_path(line[4:].rstrip('\t'))[2:]
+                    break
+                if line.startswith('--- ') and line != '--- /dev/null':
+                    path = _unquote_path(line[4:].rstrip('\t'))[2:]
+            
+            if path is None:
+                # 바이너리 등 ---/+++ 라인이 없는 경우: "diff --git a/<path> b/<path>"
+                header = chunk.split('\n', 1)[0][len('diff --git '):]
+                if header.startswith('"'):
+                    # "a/<path>" "b/<path>" - 닫는 따옴표(이스케이프되지 않은 ")까지가 a 경로
+                    match = re.match(r'"(?:[^"\\]|\\.)*"', header)
+                    path = _unquote_path(match.group())[2:] if match else header
+                else:
+                    path_len = (len(header) - len('a/ b/')) // 2
+                    path = header[2:2 + path_len]
+            
+            patches[path] = chunk
+        
+        return patches
+    
     def stage_files(self, file_paths: List[str]) -> None:
         """파일들을 staging area에 추가 (경로 리스트만 받음)"""
         # 경로 정규화 (혹시 모를 이스케이프나 따옴표 제거)
@@ -428,57 +774,80 @@ class GitAnalyzer:
             self.repo.index.add(normalized_paths)
         except Exception as e:
             # 더 자세한 오류 메시지 제공
-            import traceback
             error_msg = f"파일 staging 중 오류 발생: {e}\n"
             error_msg += f"시도한 경로들: {normalized_paths}\n"
             error_msg += f"원본 경로들: {file_paths}\n"
-            traceback.print_exc()
+            logger.debug("staging 실패", exc_info=True)
             raise RuntimeError(error_msg) from e
     
     def stage_file_changes(self, file_changes: List[FileChange]) -> None:
-        """FileChange 객체 리스트를 staging (타입에 따라 적절히 처리)"""
-        files_to_add = []
-        files_to_remove = []
+        """FileChange 객체 리스트를 staging (단일 git add 호출)
         
+        추가/수정/삭제 파일을 모두 하나의 `git add --all` 프로세스로 처리합니다.
+        경로는 명령행 인자 대신 stdin(NUL 구분)으로 전달하므로 파일 수와 무관하게
+        git 프로세스는 한 번만 실행됩니다 (git 2.26 이상, 이전 버전은 경로를 나눠서 실행).
+        경로는 glob 없이 그대로 해석합니다 (--literal-pathspecs).
+        """
+        paths = []
         for change in file_changes:
             # 경로 정규화
             normalized_path = self._parse_file_path(change.path)
-            if not normalized_path:
-                continue
-            
-            if change.change_type == 'D':
-                # 삭제된 파일은 git rm 사용
-                files_to_remove.append(normalized_path)
-            else:
-                # 추가/수정된 파일은 git add 사용
-                files_to_add.append(normalized_path)
+            if normalized_path:
+                paths.append(normalized_path)
+        
+        if not paths:
+            return
         
         try:
-            # 삭제된 파일 처리
-            if files_to_remove:
-                # GitPython의 remove 메서드 사용
-                self.repo.index.remove(files_to_remove, working_tree=False)
-            
-            # 추가/수정된 파일 처리
-            if files_to_add:
-                self.repo.index.add(files_to_add)
+            # --all: 삭제된 파일(D)도 index에서 제거 (git rm과 동일)
+            # --literal-pathspecs: '*', '?', '[' 등이 들어간 파일명을 패턴으로 해석하지 않음
+            command = ['git', '--literal-pathspecs', 'add', '--all']
+            if _git_version() >= _PATHSPEC_FROM_FILE_VERSION:
+                subprocess.run(
+                    command + ['--pathspec-from-file=-', '--pathspec-file-nul'],
+                    cwd=self.working_dir,
+                    input='\0'.join(paths).encode('utf-8'),
+                    capture_output=True,
+                    check=True
+                )
+            else:
+                for start in range(0, len(paths), _ADD_CHUNK_SIZE):
+                    subprocess.run(
+                        command + ['--'] + paths[start:start + _ADD_CHUNK_SIZE],
+                        cwd=self.working_dir,
+                        capture_output=True,
+                        check=True
+                    )
         except Exception as e:
             # 더 자세한 오류 메시지 제공
-            import traceback
+            stderr = getattr(e, 'stderr', None)
             error_msg = f"파일 staging 중 오류 발생: {e}\n"
-            error_msg += f"추가할 파일들: {files_to_add}\n"
-            error_msg += f"삭제할 파일들: {files_to_remove}\n"
-            traceback.print_exc()
+            if stderr:
+                error_msg += f"{stderr.decode('utf-8', errors='replace')}\n"
+            error_msg += f"staging할 파일들: {paths}\n"
+            logger.debug("staging 실패", exc_info=True)
             raise RuntimeError(error_msg) from e
     
     def stage_all(self) -> None:
         """모든 변경사항을 staging"""
-        self.repo.git.add(A=True)
+        self._git_output('add', '-A')
     
-    def commit(self, message: str) -> git.Commit:
+    def commit(self, message: str) -> "git.Commit":
         """커밋 생성"""
         return self.repo.index.commit(message)
     
+    def close(self) -> None:
+        """저장소 핸들 정리 (GitPython이 띄운 git cat-file 프로세스 등 해제)"""
+        if self._repo is not None:
+            self._repo.close()
+    
+    def get_current_branch(self) -> Optional[str]:
+        """현재 브랜치 이름 (detached HEAD면 None)"""
+        try:
+            return self._git_output('symbolic-ref', '--short', '-q', 'HEAD') or None
+        except subprocess.CalledProcessError:
+            return None
+    
     def get_recent_commits(self, count: int = 10) -> List[Dict[str, str]]:
         """최근 커밋 목록 가져오기 (참고용)"""
         commits = []
@@ -492,16 +861,31 @@ class GitAnalyzer:
         return commits
     
     def has_changes(self) -> bool:
-        """변경사항이 있는지 확인"""
-        return (
-            self.repo.is_dirty() or 
-            len(self.repo.untracked_files) > 0 or
-            len(self.repo.index.diff("HEAD")) > 0
+        """변경사항이 있는지 확인
+        
+        `git status --porcelain -z` 출력의 첫 바이트만 읽고 바로 종료합니다.
+        (변경사항이 하나라도 있으면 전체 상태를 끝까지 계산할 필요가 없음)
+        """
+        process = subprocess.Popen(
+            ['git', 'status', '--porcelain', '-z'],
+            cwd=self.working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
         )
+        try:
+            first = process.stdout.read(1)
+        finally:
+            if process.poll() is None:
+                process.terminate()
+            process.stdout.close()
+            process.wait()
+        
+        return bool(first)
 
 
 if __name__ == "__main__":
     # 테스트 코드
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     analyzer = GitAnalyzer()
     
     if analyzer.has_changes():
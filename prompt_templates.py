@@ -0,0 +1,82 @@
+"""
+코드 리뷰 프롬프트 템플릿
+레벨별 프롬프트를 (접두부, 접미부) 상수로 미리 만들어 두고 diff만 끼워 넣습니다.
+"""
+
+from caveman import compress
+
+QUICK_PREFIX = """Quick code review - ONLY report critical issues:
+
+Code changes:
+"""
+
+QUICK_SUFFIX = """
+
+Focus on:
+❌ Bugs (null pointer, logic errors)
+⚠️  Security issues
+🔥 Performance problems
+
+Format (Korean):
+- Use ✅/⚠️/❌ symbols
+- Max 3 items
+- Be specific and brief
+
+If no issues: "✅ 문제 없음"
+"""
+
+NORMAL_PREFIX = """Code review - balanced detail:
+
+Code changes:
+"""
+
+NORMAL_SUFFIX = """
+
+Review:
+❌ Critical: bugs, security
+⚠️  Warning: potential issues, edge cases
+💡 Suggestion: code quality, naming
+
+Format (Korean):
+- Group by severity
+- Be specific with line context
+- Max 5-7 items total
+
+If mostly good: "✅ 전반적으로 양호합니다" + any warnings
+"""
+
+DETAILED_PREFIX = """Detailed code review:
+
+Code changes:
+"""
+
+DETAILED_SUFFIX = """
+
+Analyze:
+🐛 Bugs & Logic errors
+🔒 Security vulnerabilities
+⚡ Performance issues
+🏗️  Architecture & design patterns
+📝 Code quality & readability
+✨ Best practices
+
+Format (Korean):
+- Organized by category
+- Specific examples with context
+- Actionable recommendations
+
+Provide thorough analysis.
+"""
+
+# 레벨별 (접두부, 접미부) - 알 수 없는 레벨은 normal (import 시 한 번만 압축)
+TEMPLATES = {
+    "quick": (compress(QUICK_PREFIX), compress(QUICK_SUFFIX)),
+    "normal": (compress(NORMAL_PREFIX), compress(NORMAL_SUFFIX)),
+    "detailed": (compress(DETAILED_PREFIX), compress(DETAILED_SUFFIX)),
+}
+
+
+def build_prompt(level: str, diff: str) -> str:
+    """리뷰 프롬프트 생성 (접두부 + diff + 접미부)"""
+    prefix, suffix = TEMPLATES.get(level, TEMPLATES["normal"])
+    return "".join((prefix, diff, suffix))
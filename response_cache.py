@@ -0,0 +1,127 @@
+"""
+AI 응답 캐시 모듈
+동일한 변경사항에 대한 반복 API 호출(--dry-run, --review-only, 재실행 등)을 피하기 위해
+diff 해시를 키로 AI 응답을 디스크에 저장합니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from git_analyzer import FileChange
+
+# orjson이 설치되어 있으면 사용 (없으면 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'auto_commit'
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """JSON 직렬화 (UTF-8 bytes 반환, orjson 우선)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            # 문자열이 아닌 dict 키 등 orjson이 처리하지 못하는 값은 표준 json으로
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """JSON 역직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResponseCache:
+    """diff 해시 기반 AI 응답 캐시 (메모리 + 디스크)"""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_hours: float = 24, enabled: bool = True):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (None이면 ~/.cache/auto_commit/)
+            ttl_hours: 캐시 유효 시간 (시간 단위)
+            enabled: False면 캐시를 사용하지 않음 (항상 API 호출)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.ttl_seconds = ttl_hours * 3600
+        self.enabled = enabled
+        self._memory: Dict[str, Any] = {}
+
+    @staticmethod
+    def digest_changes(changes: List["FileChange"]) -> str:
+        """변경사항(경로 + diff) 해시 계산"""
+        digest = hashlib.blake2b(digest_size=32)
+        for change in changes:
+            digest.update(change.path.encode('utf-8', errors='replace'))
+            digest.update(b'\0')
+            digest.update(hashlib.blake2b((change.diff or '').encode('utf-8', errors='replace')).digest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def digest_config(config: Dict[str, Any]) -> str:
+        """설정 해시 계산 (키 순서와 무관)"""
+        return hashlib.blake2b(dumps(config, sort_keys=True), digest_size=32).hexdigest()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """캐시 키 생성 (provider, model, level, diff 해시, 설정 등)"""
+        return hashlib.sha256('|'.join(parts).encode('utf-8', errors='replace')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+
+        if key in self._memory:
+            return self._memory[key]
+
+        try:
+            with open(self.cache_dir / f"{key}.json", 'rb') as f:
+                entry = loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('created', 0) > self.ttl_seconds:
+            return None
+
+        value = entry.get('value')
+        self._memory[key] = value
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 저장 (저장 실패는 무시)"""
+        if not self.enabled:
+            return
+
+        self._memory[key] = value
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.json"
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps({'created': time.time(), 'value': value}))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def get_or_call(self, key: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """캐시에 있으면 반환, 없으면 func 호출 후 결과 저장"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = func(*args, **kwargs)
+        if value:
+            self.set(key, value)
+        return value
@@ -23,7 +23,10 @@ setup(
         "auto_commit",
         "git_analyzer",
         "commit_message_generator",
-        "config_manager"
+        "config_manager",
+        "response_cache",
+        "prompt_templates",
+        "caveman"
     ],
     install_requires=[
         "openai>=1.0.0",
@@ -34,6 +37,12 @@ setup(
         "pyyaml>=6.0",
         "rich>=13.0.0",
     ],
+    extras_require={
+        # AI 응답 캐시 직렬화 가속 (없으면 표준 json 사용)
+        "fast": ["orjson>=3.9"],
+        # 코드 리뷰 토큰 수 계산 (없으면 글자 수 기반 추정)
+        "tokens": ["tiktoken>=0.5"],
+    },
     entry_points={
         "console_scripts": [
             "auto-commit=auto_commit:main",
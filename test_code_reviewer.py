@@ -0,0 +1,107 @@
+"""
+code_reviewer 테스트 (리뷰 캐시와 반복 리뷰 세션)
+"""
+
+import pytest
+
+import code_reviewer
+from code_reviewer import CodeReviewer, ReviewLevel, ReviewSession
+from git_analyzer import FileChange
+from response_cache import ResponseCache, loads
+
+
+CONFIG = {'ai': {'model': 'gpt-4'}, 'review': {'temperature': 0.2}, 'cache': {'enabled': True}}
+
+
+@pytest.fixture
+def reviewer(tmp_path, monkeypatch):
+    """API를 호출하지 않는 리뷰어 (호출 횟수는 reviewer.calls)"""
+    monkeypatch.setattr(code_reviewer._diff_cache, 'path', tmp_path / 'diff_cache.json')
+    reviewer = CodeReviewer(provider='openai', api_key='test', client=object(),
+                            cache=ResponseCache(cache_dir=str(tmp_path / 'responses')))
+    reviewer.calls = 0
+    reviewer.prompts = []
+
+    def review_code(compressed_diff, level, config):
+        reviewer.calls += 1
+        reviewer.prompts.append(compressed_diff)
+        return "리뷰 결과"
+
+    reviewer.provider.review_code = review_code
+    return reviewer
+
+
+def _changes():
+    diff = "@@ -1 +1 @@\n-def run(a):\n+def run(a, timeout):\n"
+    return [FileChange('app.py', 'M', 1, 1, diff)]
+
+
+def _edit():
+    diff = "@@ -1 +1 @@\n-def load(path):\n+def load(path, retries):\n"
+    return FileChange('loader.py', 'M', 1, 1, diff)
+
+
+def test_cache_hit_skips_api(reviewer):
+    first = reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL)
+    second = reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL)
+    assert reviewer.calls == 1
+    assert not first['cache_hit'] and second['cache_hit']
+    assert second['review'] == first['review']
+
+
+def test_cache_hit_commits_session(reviewer, tmp_path):
+    """캐시 적중이어도 세션 파일에 이번 diff 해시와 리뷰를 저장"""
+    reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=tmp_path / 'first.json'))
+
+    session_path = tmp_path / 'second.json'
+    result = reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL,
+                             session=ReviewSession('repo@main', path=session_path))
+    assert reviewer.calls == 1 and result['cache_hit']
+
+    saved = loads(session_path.read_bytes())['repo@main']
+    assert saved['review'] == "리뷰 결과"
+    assert saved['files'] == {'app.py': ReviewSession.digest(_changes()[0])}
+
+
+def test_session_sends_prior_review_for_unchanged_files(reviewer, tmp_path):
+    """바뀐 파일만 보낼 때 바뀌지 않은 파일을 다룬 이전 리뷰도 함께 전송"""
+    session_path = tmp_path / 'session.json'
+    reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=session_path))
+    reviewer.review(_changes() + [_edit()], CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=session_path))
+
+    assert reviewer.calls == 2
+    prompt = reviewer.prompts[-1]
+    assert "리뷰 결과" in prompt
+    assert "[unchanged: app.py (see prior review)]" in prompt
+    assert "retries" in prompt and "timeout" not in prompt
+
+
+def test_session_is_not_reused_across_levels(reviewer, tmp_path):
+    """normal 리뷰 세션을 detailed 리뷰에 재사용하지 않음"""
+    session_path = tmp_path / 'session.json'
+    reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=session_path))
+    result = reviewer.review(_changes(), CONFIG, level=ReviewLevel.DETAILED,
+                             session=ReviewSession('repo@main', path=session_path))
+
+    assert reviewer.calls == 2 and not result['cache_hit']
+    assert "[unchanged:" not in reviewer.prompts[-1]
+    assert loads(session_path.read_bytes())['repo@main']['level'] == ReviewLevel.DETAILED
+
+
+def test_prior_review_is_sent_verbatim(reviewer, tmp_path):
+    """압축된 diff(이전 리뷰 포함)에는 문구/공백 압축 규칙을 적용하지 않음"""
+    session_path = tmp_path / 'session.json'
+    prior = "Please check   run(a, timeout)\n    - could you add a test"
+    reviewer.provider.review_code = lambda compressed_diff, level, config: prior
+    reviewer.review(_changes(), CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=session_path))
+
+    prompts = []
+    reviewer.provider.review_code = lambda compressed_diff, level, config: prompts.append(compressed_diff) or "ok"
+    reviewer.review(_changes() + [_edit()], CONFIG, level=ReviewLevel.NORMAL,
+                    session=ReviewSession('repo@main', path=session_path))
+    assert prior in prompts[0]
@@ -0,0 +1,52 @@
+"""
+commit_message_generator 테스트 (AI 호출 없는 템플릿 메시지)
+"""
+
+from commit_message_generator import TRIVIAL_NEW_FILE_LINES, _try_trivial_message
+from git_analyzer import FileChange
+
+
+def test_trivial_small_new_file():
+    changes = [FileChange('docs/notes.md', 'A', 3, 0, '+a\n+b\n+c')]
+    assert _try_trivial_message(changes) == "feat: add docs/notes.md"
+
+
+def test_large_new_file_is_not_trivial():
+    lines = TRIVIAL_NEW_FILE_LINES
+    changes = [FileChange('big.py', 'A', lines, 0, '+x\n' * lines)]
+    assert _try_trivial_message(changes) is None
+
+
+def test_trivial_reindent():
+    diff = "@@ -1,2 +1,2 @@\n-function f(a) {\n-\treturn a;  \n+function f(a) {\n+    return a;\n"
+    changes = [FileChange('a.js', 'M', 2, 2, diff)]
+    assert _try_trivial_message(changes) == "style: whitespace cleanup"
+
+
+def test_trailing_whitespace_in_python_is_trivial():
+    diff = "@@ -1,2 +1,2 @@\n-def f(a):   \n-    return a\t\n+def f(a):\n+    return a\n"
+    changes = [FileChange('a.py', 'M', 2, 2, diff)]
+    assert _try_trivial_message(changes) == "style: whitespace cleanup"
+
+
+def test_reindent_in_indent_sensitive_file_is_not_trivial():
+    """Python/YAML은 들여쓰기가 블록 구조를 바꿀 수 있음"""
+    python_diff = "@@ -1,3 +1,3 @@\n if a:\n     b()\n-c()\n+    c()\n"
+    yaml_diff = "@@ -1,2 +1,2 @@\n ai:\n-model: gpt-4\n+  model: gpt-4\n"
+    assert _try_trivial_message([FileChange('a.py', 'M', 1, 1, python_diff)]) is None
+    assert _try_trivial_message([FileChange('config.yaml', 'M', 1, 1, yaml_diff)]) is None
+
+
+def test_token_split_is_not_trivial():
+    diff = "@@ -1 +1 @@\n-x = a b\n+x = ab\n"
+    assert _try_trivial_message([FileChange('a.js', 'M', 1, 1, diff)]) is None
+
+
+def test_code_change_is_not_trivial():
+    diff = "@@ -1 +1 @@\n-return a\n+return b\n"
+    assert _try_trivial_message([FileChange('a.py', 'M', 1, 1, diff)]) is None
+
+
+def test_multiple_new_files_are_not_trivial():
+    changes = [FileChange('a.py', 'A', 1, 0, '+a'), FileChange('b.py', 'A', 1, 0, '+b')]
+    assert _try_trivial_message(changes) is None
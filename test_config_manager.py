@@ -0,0 +1,68 @@
+"""
+config_manager 테스트 (병합 설정 캐시와 JSON 사본)
+"""
+
+import os
+
+import pytest
+
+import config_manager
+from config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """임시 config.yaml (캐시 디렉토리도 임시 경로로)"""
+    monkeypatch.setattr(config_manager, 'CONFIG_CACHE_DIR', tmp_path / 'cache')
+    for name in ('AI_MODEL', 'AI_TEMPERATURE', 'AI_MAX_TOKENS'):
+        monkeypatch.delenv(name, raising=False)
+    config_manager._CONFIG_CACHE.clear()
+    path = tmp_path / 'config.yaml'
+    path.write_text("ai:\n  model: test-model\n", encoding='utf-8')
+    yield path
+    config_manager._CONFIG_CACHE.clear()
+
+
+def _fail_yaml():
+    raise AssertionError("YAML을 다시 파싱하면 안 됩니다")
+
+
+def test_merges_with_defaults(config_file):
+    config = ConfigManager(config_path=str(config_file))
+    assert config.get('ai.model') == 'test-model'
+    assert config.get('ai.max_tokens') == ConfigManager.DEFAULT_CONFIG['ai']['max_tokens']
+
+
+def test_memory_cache_returns_copy(config_file, monkeypatch):
+    first = ConfigManager(config_path=str(config_file))
+    first.config['ai']['model'] = 'changed'
+    monkeypatch.setattr(config_manager, '_yaml_loader', _fail_yaml)
+    second = ConfigManager(config_path=str(config_file))
+    assert second.get('ai.model') == 'test-model'
+
+
+def test_modified_file_is_reloaded(config_file):
+    ConfigManager(config_path=str(config_file))
+    config_file.write_text("ai:\n  model: other-model-name\n", encoding='utf-8')
+    st = os.stat(config_file)
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert ConfigManager(config_path=str(config_file)).get('ai.model') == 'other-model-name'
+
+
+def test_sidecar_skips_yaml(config_file, monkeypatch):
+    ConfigManager(config_path=str(config_file))
+    assert list(config_manager.CONFIG_CACHE_DIR.glob('*.json'))
+
+    # 새 프로세스처럼 메모리 캐시를 비워도 JSON 사본을 사용
+    config_manager._CONFIG_CACHE.clear()
+    monkeypatch.setattr(config_manager, '_yaml_loader', _fail_yaml)
+    assert ConfigManager(config_path=str(config_file)).get('ai.model') == 'test-model'
+
+
+def test_default_config_change_invalidates_sidecar(config_file, monkeypatch):
+    ConfigManager(config_path=str(config_file))
+    config_manager._CONFIG_CACHE.clear()
+
+    defaults = dict(ConfigManager.DEFAULT_CONFIG, extra={'enabled': True})
+    monkeypatch.setattr(ConfigManager, 'DEFAULT_CONFIG', defaults)
+    assert ConfigManager(config_path=str(config_file)).get('extra.enabled') is True
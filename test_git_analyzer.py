@@ -0,0 +1,122 @@
+"""
+git_analyzer 테스트 (patch 분리, 라인 수 계산, staging)
+"""
+
+import subprocess
+
+import pytest
+
+from git_analyzer import FileChange, GitAnalyzer
+
+
+def _git(cwd, *args):
+    subprocess.run(['git', *args], cwd=cwd, capture_output=True, check=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """커밋 하나가 있는 임시 저장소"""
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'config', 'user.email', 'test@example.com')
+    _git(tmp_path, 'config', 'user.name', 'test')
+    (tmp_path / 'old.txt').write_text('a\nb\n')
+    (tmp_path / 'image.bin').write_bytes(b'\x00\x01')
+    (tmp_path / 'q"uote.txt').write_text('q\n')
+    (tmp_path / 'my file.txt').write_text('x\n')
+    _git(tmp_path, 'add', '-A')
+    _git(tmp_path, 'commit', '-q', '-m', 'init')
+    return tmp_path
+
+
+@pytest.fixture
+def analyzer(repo):
+    analyzer = GitAnalyzer(str(repo))
+    yield analyzer
+    analyzer.close()
+
+
+def test_split_patch_rename(repo, analyzer):
+    """내용이 같은 이름 변경은 새 경로로 분리"""
+    _git(repo, 'mv', 'old.txt', 'renamed_longer.txt')
+    patches = analyzer._get_path_patches(['old.txt', 'renamed_longer.txt'])
+    assert list(patches) == ['renamed_longer.txt']
+    assert 'rename to renamed_longer.txt' in patches['renamed_longer.txt']
+
+
+def test_split_patch_binary(repo, analyzer):
+    """---/+++ 라인이 없는 바이너리 patch는 diff --git 헤더에서 경로 추출"""
+    (repo / 'image.bin').write_bytes(b'\x00\x02')
+    (repo / 'old.txt').write_text('a\nc\n')
+    _git(repo, 'add', '-A')
+    patches = analyzer._get_path_patches(['image.bin', 'old.txt'])
+    assert set(patches) == {'image.bin', 'old.txt'}
+    assert 'Binary files' in patches['image.bin']
+    assert patches['old.txt'].startswith('diff --git a/old.txt b/old.txt')
+    assert '+c' in patches['old.txt']
+
+
+def test_split_patch_quoted_paths(repo, analyzer):
+    """따옴표로 감싼 경로와 공백이 있는 경로"""
+    (repo / 'q"uote.txt').write_text('q2\n')
+    (repo / 'my file.txt').write_text('x2\n')
+    (repo / 'b"in.dat').write_bytes(b'\x00\x03')
+    _git(repo, 'add', '-A')
+    patches = analyzer._get_path_patches(['q"uote.txt', 'my file.txt', 'b"in.dat'])
+    assert set(patches) == {'q"uote.txt', 'my file.txt', 'b"in.dat'}
+    assert '+q2' in patches['q"uote.txt']
+    assert '+x2' in patches['my file.txt']
+
+
+def test_split_patch_deleted(repo, analyzer):
+    """삭제 파일은 --- a/<path> 기준"""
+    _git(repo, 'rm', '-q', 'old.txt')
+    patches = analyzer._get_path_patches(['old.txt'])
+    assert list(patches) == ['old.txt']
+    assert '-a' in patches['old.txt']
+
+
+@pytest.mark.parametrize('option', ['diff.noprefix', 'diff.mnemonicPrefix'])
+def test_split_patch_ignores_prefix_config(repo, analyzer, option):
+    """사용자 git 설정이 a/, b/ 접두사를 바꿔도 경로는 그대로"""
+    _git(repo, 'config', option, 'true')
+    (repo / 'old.txt').write_text('a\nc\n')
+    (repo / 'image.bin').write_bytes(b'\x00\x02')
+    _git(repo, 'add', '-A')
+    patches = analyzer._get_path_patches(['old.txt', 'image.bin'])
+    assert set(patches) == {'old.txt', 'image.bin'}
+    assert '+c' in patches['old.txt']
+
+
+@pytest.mark.parametrize('diff_text, expected', [
+    ('', (0, 0)),
+    ('+new\n-old\n context\n+more', (2, 1)),
+    ('--- a/x\n+++ b/x\n@@ -1 +1 @@\n-a\n+b', (1, 1)),
+    ('-first\n+second', (1, 1)),
+    ('+first', (1, 0)),
+])
+def test_count_changes(analyzer, diff_text, expected):
+    assert analyzer._count_changes(diff_text) == expected
+
+
+def test_stage_file_changes_literal_pathspec(repo, analyzer):
+    """glob 문자가 들어간 파일명은 패턴으로 해석하지 않음"""
+    (repo / 'a*.txt').write_text('1\n')
+    (repo / 'ab.txt').write_text('2\n')
+    analyzer.stage_file_changes([FileChange('a*.txt', 'A', 1, 0, '')])
+    staged = subprocess.run(['git', 'diff', '--cached', '--name-only'], cwd=repo,
+                            capture_output=True, check=True).stdout.decode().split()
+    assert staged == ['a*.txt']
+
+
+def test_load_diffs_fills_untracked_files(repo, analyzer):
+    """patches=False로 가져온 untracked 파일도 load_diffs 후에는 내용이 채워짐"""
+    (repo / 'new.py').write_text('print(1)\n')
+    (repo / 'old.txt').write_text('a\nc\n')
+    changes = analyzer.get_all_changes(include_untracked=True, patches=False)
+    files = changes.staged_files + changes.unstaged_files
+    assert all(not f.diff for f in files)
+
+    analyzer.load_diffs(files)
+    diffs = {f.path: f.diff for f in files}
+    assert diffs['new.py'] == 'print(1)\n'
+    assert '+c' in diffs['old.txt']